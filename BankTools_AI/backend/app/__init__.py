@@ -5,6 +5,7 @@ from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_cors import CORS
 from .config import Config
+from .json_provider import init_json_provider
 
 db = SQLAlchemy()
 login_manager = LoginManager()
@@ -14,6 +15,7 @@ migrate = Migrate()
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    init_json_provider(app)
     
     # Initialize extensions
     db.init_app(app)
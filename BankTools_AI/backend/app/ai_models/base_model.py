@@ -3,9 +3,6 @@ Base model class with common functionality for AI models
 """
 
 import numpy as np
-import pandas as pd
-import joblib
-import matplotlib.pyplot as plt
 from typing import Dict, Any, Tuple, Optional
 from abc import ABC, abstractmethod
 
@@ -45,7 +42,8 @@ class LogisticRegression:
     Custom Logistic Regression implementation from scratch using numpy
     """
     
-    def __init__(self, learning_rate: float = 0.01, max_iterations: int = 1000, tolerance: float = 1e-6):
+    def __init__(self, learning_rate: float = 0.01, max_iterations: int = 1000, tolerance: float = 1e-6,
+                 random_state: Optional[int] = None):
         """
         Initialize the logistic regression model
         
@@ -53,13 +51,16 @@ class LogisticRegression:
             learning_rate: Learning rate for gradient descent
             max_iterations: Maximum number of iterations
             tolerance: Convergence tolerance
+            random_state: Seed for the generator used for weight init
         """
         self.learning_rate = learning_rate
         self.max_iterations = max_iterations
         self.tolerance = tolerance
+        self.random_state = random_state
+        self.rng = np.random.default_rng(random_state)
         self.weights = None
         self.bias = None
-        self.cost_history = []
+        self.cost_history = np.empty(0, dtype=np.float64)
         
     def sigmoid(self, z: np.ndarray) -> np.ndarray:
         """Sigmoid activation function with clipping to prevent overflow"""
@@ -80,9 +81,12 @@ class LogisticRegression:
         m, n = X.shape
         
         # Initialize weights and bias
-        self.weights = np.random.normal(0, 0.01, n).astype(np.float64)
+        self.weights = self.rng.normal(0, 0.01, n)
         self.bias = 0.0
         
+        # Written by index; trimmed to the iterations actually run
+        cost_history = np.empty(self.max_iterations, dtype=np.float64)
+        n_logged = 0
         prev_cost = float('inf')
         
         for i in range(self.max_iterations):
@@ -92,7 +96,8 @@ class LogisticRegression:
             
             # Compute cost (log-likelihood)
             cost = self._compute_cost(y, predictions)
-            self.cost_history.append(cost)
+            cost_history[i] = cost
+            n_logged = i + 1
             
             # Compute gradients
             dw = (1/m) * X.T.dot(predictions - y)
@@ -111,6 +116,8 @@ class LogisticRegression:
             
             if i % 100 == 0:
                 print(f"Iteration {i}, Cost: {cost:.4f}")
+        
+        self.cost_history = cost_history[:n_logged]
     
     def _compute_cost(self, y_true: np.ndarray, y_pred: np.ndarray) -> float:
         """Compute logistic regression cost (cross-entropy)"""
@@ -5,10 +5,11 @@ Refactored for readability and maintainability
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import joblib
 import os
+import threading
 import warnings
+import zipfile
 from typing import Tuple, Dict, Any, List, Optional
 
 # Import modular components from shared utilities
@@ -28,12 +29,20 @@ class ChurnPredictor(BasePredictor):
     
     def __init__(self):
         super().__init__()
-        self.model = LogisticRegression(learning_rate=0.1, max_iterations=2000)
+        self.model = LogisticRegression(learning_rate=0.1, max_iterations=2000, random_state=42)
         self.feature_means = None
         self.feature_stds = None
         self.data_quality_assessor = DataQualityAssessment()
         self.data_cleaner = EnhancedDataCleaner()
         self.data_quality_report = None
+        # Weights with the z-score normalization folded in, for raw feature vectors
+        self._w_fused = None
+        self._b_fused = None
+        # Feature-name -> column index maps for single-row inference
+        self._numeric_slots: Dict[str, int] = {}
+        self._dummy_slots: Dict[Tuple[str, str], int] = {}
+        # Per-thread feature vector reused by every single-row prediction
+        self._buffers = threading.local()
         
     def load_and_preprocess_data(self, filepath: str) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -101,13 +110,15 @@ class ChurnPredictor(BasePredictor):
         
         print(f"\nTarget distribution after cleaning:\n{df_processed['Exited'].value_counts()}")
         
-        # One-hot encode categorical variables
+        # One-hot encode categorical variables (uint8 dummies rather than bool,
+        # so the feature matrix below is numeric instead of an object array)
         categorical_cols = ['Geography', 'Gender']
         existing_categorical_cols = [col for col in categorical_cols if col in df_processed.columns]
         
         if existing_categorical_cols:
             df_encoded = pd.get_dummies(df_processed, columns=existing_categorical_cols, 
-                                      prefix=existing_categorical_cols, drop_first=False)
+                                      prefix=existing_categorical_cols, drop_first=False,
+                                      dtype=np.uint8)
         else:
             df_encoded = df_processed
         
@@ -125,7 +136,7 @@ class ChurnPredictor(BasePredictor):
         final_quality = self.data_quality_assessor.assess_completeness(X)
         print(f"Final feature matrix completeness: {final_quality['completeness_percentage']:.1f}%")
         
-        return X.values, y
+        return X.to_numpy(dtype=np.float32), y
     
     def _get_churn_validation_rules(self) -> Dict[str, Any]:
         """Define validation rules for churn data"""
@@ -226,12 +237,12 @@ class ChurnPredictor(BasePredictor):
         print("Training logistic regression model...")
         self.model.fit(X_train_norm, y_train)
         
-        # Evaluate on all sets
-        train_metrics = self._evaluate_model(X_train_norm, y_train)
-        val_metrics = self._evaluate_model(X_val_norm, y_val)
-        test_metrics = self._evaluate_model(X_test_norm, y_test)
+        # Evaluate on all sets with one forward pass
+        train_metrics, val_metrics, test_metrics = self._evaluate_splits(
+            (X_train_norm, y_train), (X_val_norm, y_val), (X_test_norm, y_test))
         
         self.is_trained = True
+        self._prepare_inference_state()
         
         # Print results
         ModelEvaluator.print_evaluation_results(train_metrics, "Train")
@@ -246,13 +257,6 @@ class ChurnPredictor(BasePredictor):
             'feature_names': self.feature_names
         }
     
-    def _evaluate_model(self, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
-        """Evaluate model performance"""
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
-        
-        return ModelEvaluator.evaluate_binary_classification(y, predictions, probabilities)
-    
     def predict(self, customer_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Predict churn for a single customer
@@ -266,25 +270,56 @@ class ChurnPredictor(BasePredictor):
         if not self.is_trained:
             raise ValueError("Model not trained yet. Call train() first.")
         
-        # Create DataFrame from input
-        df = pd.DataFrame([customer_data])
+        # Build the feature vector directly, without pandas
+        x = self._encode_single(customer_data)
+        
+        # Predict on the raw features with the fused weights
+        probability = float(self.model.sigmoid(np.dot(x, self._w_fused) + self._b_fused))
+        
+        return self._build_prediction_result(customer_data, probability)
+    
+    def predict_batch(self, customers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Predict churn for several customers at once
         
-        # Preprocess same as training data
-        df_encoded = pd.get_dummies(df, columns=['Geography', 'Gender'], prefix=['Geography', 'Gender'])
+        The customers are encoded column by column into one feature matrix and
+        scored with a single product against the fused weights.
         
-        # Ensure all training features are present
-        for feature in self.feature_names:
-            if feature not in df_encoded.columns:
-                df_encoded[feature] = 0
+        Args:
+            customers: List of dictionaries with customer features
+            
+        Returns:
+            List of prediction results, in the same order as the input
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet. Call train() first.")
         
-        # Reorder columns to match training
-        df_encoded = df_encoded[self.feature_names]
+        if not customers:
+            return []
         
-        # Normalize
-        X_norm, _, _ = DataUtils.normalize_features(df_encoded.values, self.feature_means, self.feature_stds)
+        df = pd.DataFrame(customers)
         
-        # Predict
-        probability = self.model.predict_proba(X_norm)[0]
+        # Features missing from the input stay 0, as in _encode_single
+        X = np.zeros((len(df), len(self.feature_names)), dtype=np.float64)
+        numeric = [feature for feature in self._numeric_slots if feature in df.columns]
+        if numeric:
+            X[:, [self._numeric_slots[feature] for feature in numeric]] = (
+                df[numeric].to_numpy(dtype=np.float64, na_value=0.0))
+        
+        for col in ('Geography', 'Gender'):
+            if col in df.columns:
+                slots = df[col].astype(str).map(
+                    {value: idx for (slot_col, value), idx in self._dummy_slots.items() if slot_col == col})
+                rows = np.flatnonzero(slots.notna().to_numpy())
+                X[rows, slots.to_numpy()[rows].astype(np.intp)] = 1.0
+        
+        probabilities = self.model.sigmoid(X @ self._w_fused + self._b_fused)
+        
+        return [self._build_prediction_result(customer, float(probability))
+                for customer, probability in zip(customers, probabilities)]
+    
+    def _build_prediction_result(self, customer_data: Dict[str, Any], probability: float) -> Dict[str, Any]:
+        """Turn a raw churn probability into the prediction result dictionary"""
         prediction = int(probability >= 0.5)
         
         # Updated risk thresholds for better sensitivity to churn detection
@@ -305,6 +340,67 @@ class ChurnPredictor(BasePredictor):
             'recommendations': recommendations
         }
     
+    def _prepare_inference_state(self) -> None:
+        """Precompute everything single-row inference needs once the model is trained or loaded"""
+        self._build_feature_slots()
+        
+        # Fold the normalization into the weights:
+        # w . (x - mean) / std + b == x . (w / std) + (b - (w / std) . mean)
+        self._w_fused = np.asarray(self.model.weights, dtype=np.float64) / self.feature_stds
+        self._b_fused = float(self.model.bias - np.dot(self._w_fused, self.feature_means))
+    
+    def _build_feature_slots(self) -> None:
+        """Precompute where each numeric value and one-hot category lands in the feature vector"""
+        self._numeric_slots = {}
+        self._dummy_slots = {}
+        
+        for idx, feature in enumerate(self.feature_names):
+            for col in ('Geography', 'Gender'):
+                prefix = f"{col}_"
+                if feature.startswith(prefix):
+                    self._dummy_slots[(col, feature[len(prefix):])] = idx
+                    break
+            else:
+                self._numeric_slots[feature] = idx
+    
+    def _feature_buffer(self) -> np.ndarray:
+        """Zeroed feature vector owned by the calling thread, reused across predictions"""
+        x = getattr(self._buffers, 'x', None)
+        if x is None or len(x) != len(self.feature_names):
+            x = self._buffers.x = np.zeros(len(self.feature_names), dtype=np.float64)
+        else:
+            x.fill(0.0)
+        return x
+    
+    def _encode_single(self, customer_data: Dict[str, Any]) -> np.ndarray:
+        """
+        Build the raw (unnormalized) feature vector for one customer
+        
+        Matches one-hot encoding the customer as a one-row DataFrame and
+        aligning it with the training features. The vector is the calling
+        thread's reusable buffer, valid until its next call.
+        
+        Args:
+            customer_data: Dictionary with customer features
+            
+        Returns:
+            Feature vector aligned with self.feature_names
+        """
+        # Features missing from the input stay 0
+        x = self._feature_buffer()
+        
+        for feature, idx in self._numeric_slots.items():
+            if feature in customer_data:
+                x[idx] = customer_data[feature]
+        
+        for col in ('Geography', 'Gender'):
+            if col in customer_data:
+                idx = self._dummy_slots.get((col, str(customer_data[col])))
+                if idx is not None:
+                    x[idx] = 1.0
+        
+        return x
+    
     def _generate_churn_recommendations(self, data: Dict[str, Any], probability: float, prediction: int) -> List[str]:
         """Generate personalized recommendations based on churn prediction"""
         recommendations = []
@@ -351,33 +447,69 @@ class ChurnPredictor(BasePredictor):
         return recommendations
     
     def save_model(self, filepath: str) -> None:
-        """Save the trained model"""
+        """Save the trained model as a compact npz archive of float32 arrays"""
         if not self.is_trained:
             raise ValueError("No trained model to save")
         
-        model_data = {
-            'model': self.model,
-            'feature_means': self.feature_means,
-            'feature_stds': self.feature_stds,
-            'feature_names': self.feature_names,
-            'is_trained': self.is_trained
-        }
-        joblib.dump(model_data, filepath)
+        # Written through a file handle so numpy keeps the given path as is
+        with open(filepath, 'wb') as f:
+            np.savez_compressed(
+                f,
+                w=np.asarray(self.model.weights, dtype=np.float32),
+                b=np.float32(self.model.bias),
+                mean=np.asarray(self.feature_means, dtype=np.float32),
+                std=np.asarray(self.feature_stds, dtype=np.float32),
+                names=np.array(self.feature_names)
+            )
         super().save_model(filepath)
     
     def load_model(self, filepath: str) -> None:
-        """Load a trained model"""
-        model_data = joblib.load(filepath)
+        """
+        Load a trained model (npz archive, or a legacy joblib pickle)
+        
+        is_trained is only set once the inference state is ready, so the
+        predictor never reports trained while it can't predict yet.
+        """
+        self.is_trained = False
+        if not zipfile.is_zipfile(filepath):
+            trained = self._load_legacy_model(filepath)
+        else:
+            with np.load(filepath) as data:
+                self.model = LogisticRegression(learning_rate=0.1, max_iterations=2000)
+                self.model.weights = data['w'].astype(np.float64)
+                self.model.bias = float(data['b'])
+                self.feature_means = data['mean'].astype(np.float64)
+                self.feature_stds = data['std'].astype(np.float64)
+                self.feature_names = data['names'].tolist()
+            trained = True
+        self._prepare_inference_state()
+        self.is_trained = trained
+        super().load_model(filepath)
+    
+    def _load_legacy_model(self, filepath: str) -> bool:
+        """
+        Load a model saved as a joblib pickle of the full predictor state
+        
+        The arrays are memory-mapped read-only, so workers forked after the
+        load share their pages instead of each holding a copy. Retraining
+        replaces them rather than writing into them.
+        
+        Returns:
+            The stored is_trained flag
+        """
+        model_data = joblib.load(filepath, mmap_mode='r')
         self.model = model_data['model']
         self.feature_means = model_data['feature_means']
         self.feature_stds = model_data['feature_stds']
         self.feature_names = model_data['feature_names']
-        self.is_trained = model_data['is_trained']
-        super().load_model(filepath)
+        return model_data['is_trained']
     
     def plot_training_history(self) -> None:
         """Plot training cost history"""
-        if not self.model.cost_history:
+        # Imported here so the API server never loads matplotlib
+        import matplotlib.pyplot as plt
+        
+        if len(self.model.cost_history) == 0:
             print("No training history available")
             return
         
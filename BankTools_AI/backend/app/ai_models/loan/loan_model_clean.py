@@ -5,10 +5,11 @@ Refactored for readability and maintainability
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import joblib
+import math
 import os
 import warnings
+import zipfile
 from typing import Tuple, Dict, Any, List
 
 # Import modular components from shared utilities
@@ -16,9 +17,60 @@ from ..shared.base_model import BasePredictor, LogisticRegression, ModelEvaluato
 from ..shared.data_cleaners import LoanDataCleaner
 from ..shared.feature_engineering import LoanFeatureEngineer
 
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
 warnings.filterwarnings('ignore')
 
 
+# Known column types of the loan dataset, so read_csv skips type inference
+_LOAN_DTYPES = {
+    'Gender': 'category',
+    'Married': 'category',
+    'Education': 'category',
+    'Self_Employed': 'category',
+    'Property_Area': 'category',
+    'ApplicantIncome': 'float32',
+    'CoapplicantIncome': 'float32',
+    'LoanAmount': 'float32',
+    'Loan_Amount_Term': 'float32',
+    'Credit_History': 'float32'
+}
+
+# Columns the pipeline reads, in dataset order (the pyarrow engine returns
+# them in this order); anything else, e.g. Loan_ID, is never parsed
+_LOAN_COLUMNS = [
+    'Gender', 'Married', 'Dependents', 'Education', 'Self_Employed',
+    'ApplicantIncome', 'CoapplicantIncome', 'LoanAmount', 'Loan_Amount_Term',
+    'Credit_History', 'Property_Area', 'Loan_Status'
+]
+
+# Columns one-hot encoded into the feature matrix
+_CATEGORICAL_COLS = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
+
+# Model fields the frontend form doesn't collect (no co-applicant assumed)
+_MODEL_DEFAULTS = {
+    'Gender': 'Male',
+    'Married': 'Yes',
+    'Dependents': 0,
+    'Education': 'Graduate',
+    'Self_Employed': 'No',
+    'Property_Area': 'Urban',
+    'CoapplicantIncome': 0
+}
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    """Vectorized sigmoid, evaluated in a single fused pass by numexpr when installed"""
+    # Clip so exp() cannot overflow
+    z = np.clip(np.asarray(z, dtype=np.float64), -500, 500)
+    if ne is None:
+        return 1 / (1 + np.exp(-z))
+    return ne.evaluate('1 / (1 + exp(-z))', local_dict={'z': z})
+
+
 class LoanPredictor(BasePredictor):
     """
     Clean loan prediction pipeline with modular components
@@ -26,10 +78,21 @@ class LoanPredictor(BasePredictor):
     
     def __init__(self):
         super().__init__()
-        self.model = LogisticRegression(learning_rate=0.01, max_iterations=1000)
+        self.model = LogisticRegression(learning_rate=0.01, max_iterations=1000, random_state=42)
         self.feature_means = None
         self.feature_stds = None
         self.label_encoders = {}
+        # Weights with the z-score normalization folded in, for raw feature vectors
+        self._w_fused = None
+        self._b_fused = None
+        # Feature-name -> column index maps for single-row inference
+        self._predict_index_map: Dict[str, int] = {}
+        self._onehot_map: Dict[Tuple[str, str], int] = {}
+        # Per categorical column: its training categories and their one-hot columns
+        self._category_maps: Dict[str, pd.Index] = {}
+        self._category_columns: Dict[str, np.ndarray] = {}
+        # Straight-line scoring function generated for the trained feature layout
+        self._scorer = None
         
     def load_and_preprocess_data(self, filepath: str) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -45,7 +108,7 @@ class LoanPredictor(BasePredictor):
         print("Loading loan dataset...")
         
         try:
-            df = pd.read_csv(filepath)
+            df = self._read_loan_csv(filepath)
         except Exception as e:
             raise ValueError(f"Error loading CSV file: {str(e)}")
         
@@ -69,34 +132,78 @@ class LoanPredictor(BasePredictor):
         
         print(f"\nTarget distribution after cleaning:\n{df_processed['Loan_Status'].value_counts()}")
         
-        # Encode categorical variables
-        categorical_cols = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
-        existing_categorical_cols = [col for col in categorical_cols if col in df_processed.columns]
-        
-        if existing_categorical_cols:
-            df_encoded = pd.get_dummies(df_processed, columns=existing_categorical_cols, 
-                                      prefix=existing_categorical_cols, drop_first=False)
-        else:
-            df_encoded = df_processed
+        existing_categorical_cols = [col for col in _CATEGORICAL_COLS if col in df_processed.columns]
         
         # Separate features and target
-        X = df_encoded.drop('Loan_Status', axis=1)
-        y = df_encoded['Loan_Status'].values
+        features_df = df_processed.drop('Loan_Status', axis=1)
+        y = df_processed['Loan_Status'].to_numpy()
         
         # Final check: drop any remaining string columns that slipped through
-        string_columns = X.select_dtypes(include=['object']).columns.tolist()
+        string_columns = [col for col in features_df.select_dtypes(include=['object']).columns
+                          if col not in existing_categorical_cols]
         if string_columns:
             print(f"Dropping remaining string columns: {string_columns}")
-            X = X.drop(string_columns, axis=1)
+            features_df = features_df.drop(string_columns, axis=1)
+        
+        # Encode categorical variables; float32 keeps the per-iteration products in fit on half the bytes
+        X = self._encode(features_df, fit=True, dtype=np.float32)
         
-        # Convert target to binary (Y=1, N=0)
-        y = (y == 'Y').astype(int)
+        # Convert target to binary (Y=1, N=0); the bool mask is reinterpreted, not copied
+        y = (y == 'Y').view(np.uint8)
         
-        # Store feature names
-        self.feature_names = X.columns.tolist()
         print(f"\nFinal features ({len(self.feature_names)}): {self.feature_names}")
         
-        return X.values, y
+        return X, y
+    
+    @staticmethod
+    def _read_loan_csv(filepath: str) -> pd.DataFrame:
+        """Read the loan CSV with the multithreaded pyarrow parser, if available"""
+        try:
+            return pd.read_csv(filepath, engine='pyarrow', usecols=_LOAN_COLUMNS, dtype=_LOAN_DTYPES)
+        except ImportError:
+            return pd.read_csv(filepath, usecols=_LOAN_COLUMNS, dtype=_LOAN_DTYPES)
+    
+    def _encode(self, df: pd.DataFrame, fit: bool = False, dtype=np.float64) -> np.ndarray:
+        """
+        Build the feature matrix: numeric columns followed by the one-hot block
+        
+        With fit=True the feature names (and from them the category maps) are
+        learned from df; otherwise the training categories are reused, so the
+        columns always line up with training. Unknown or missing categories
+        get an all-zero one-hot row.
+        
+        Args:
+            df: DataFrame with numeric and categorical columns
+            fit: Learn the encoding from df (training only)
+            dtype: dtype of the returned matrix
+            
+        Returns:
+            Feature matrix aligned with self.feature_names
+        """
+        if fit:
+            categorical_cols = [col for col in _CATEGORICAL_COLS if col in df.columns]
+            feature_names = [col for col in df.columns if col not in categorical_cols]
+            for col in categorical_cols:
+                categories = pd.factorize(df[col], sort=True)[1]
+                feature_names.extend(f"{col}_{category}" for category in categories)
+            self.feature_names = feature_names
+            self._build_feature_maps()
+        
+        X = np.zeros((len(df), len(self.feature_names)), dtype=dtype)
+        
+        # Numeric features missing from df stay 0
+        numeric_cols = list(self._predict_index_map)
+        X[:, list(self._predict_index_map.values())] = df.reindex(
+            columns=numeric_cols, fill_value=0).to_numpy(dtype=np.float64)
+        
+        for col, categories in self._category_maps.items():
+            if col not in df.columns:
+                continue
+            codes = pd.Categorical(df[col], categories=categories).codes
+            rows = np.flatnonzero(codes >= 0)
+            X[rows, self._category_columns[col][codes[rows]]] = 1
+        
+        return X
     
     def train(self, filepath: str) -> Dict[str, Any]:
         """
@@ -116,21 +223,22 @@ class LoanPredictor(BasePredictor):
         # Split data
         X_train, X_val, X_test, y_train, y_val, y_test = DataUtils.split_data(X, y)
         
-        # Normalize features
-        X_train_norm, self.feature_means, self.feature_stds = DataUtils.normalize_features(X_train)
-        X_val_norm, _, _ = DataUtils.normalize_features(X_val, self.feature_means, self.feature_stds)
-        X_test_norm, _, _ = DataUtils.normalize_features(X_test, self.feature_means, self.feature_stds)
+        # Normalize features in place (split_data hands back fresh copies)
+        self.feature_means, self.feature_stds = DataUtils.compute_stats(X_train)
+        for X_part in (X_train, X_val, X_test):
+            DataUtils.normalize_inplace(X_part, self.feature_means, self.feature_stds)
         
         # Train model
         print("Training logistic regression model...")
-        self.model.fit(X_train_norm, y_train)
+        self.model.fit(X_train, y_train)
         
-        # Evaluate on all sets
-        train_metrics = self._evaluate_model(X_train_norm, y_train)
-        val_metrics = self._evaluate_model(X_val_norm, y_val)
-        test_metrics = self._evaluate_model(X_test_norm, y_test)
+        # Evaluate on all sets with one forward pass
+        train_metrics, val_metrics, test_metrics = self._evaluate_splits(
+            (X_train, y_train), (X_val, y_val), (X_test, y_test))
         
         self.is_trained = True
+        self._w_fused = self._b_fused = None
+        self._prepare_inference_state()
         
         # Print results
         ModelEvaluator.print_evaluation_results(train_metrics, "Train")
@@ -145,13 +253,6 @@ class LoanPredictor(BasePredictor):
             'feature_names': self.feature_names
         }
     
-    def _evaluate_model(self, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
-        """Evaluate model performance"""
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
-        
-        return ModelEvaluator.evaluate_binary_classification(y, predictions, probabilities)
-    
     def predict(self, loan_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Predict loan approval for a single application
@@ -168,8 +269,39 @@ class LoanPredictor(BasePredictor):
         # Convert frontend data to model format
         model_data = self._convert_frontend_to_model_format(loan_data)
         
+        # Score the raw features with the generated scorer: plain float
+        # arithmetic, no feature vector, pandas or numpy dispatch.
+        # model_data is a fresh dictionary, so it is extended in place
+        z = self._scorer(self._derive_features(model_data))
+        z = min(max(z, -500.0), 500.0)
+        probability = 1.0 / (1.0 + math.exp(-z))
+        
+        return self._build_prediction_result(loan_data, probability)
+    
+    def predict_batch(self, applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Predict loan approval for several applications at once
+        
+        The applications are preprocessed as one DataFrame and scored with a
+        single product against the fused weights.
+        
+        Args:
+            applications: List of dictionaries with loan application features
+            
+        Returns:
+            List of prediction results, in the same order as the input
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet. Call train() first.")
+        
+        if not applications:
+            return []
+        
+        # Convert frontend data to model format
+        model_rows = [self._convert_frontend_to_model_format(app) for app in applications]
+        
         # Create DataFrame from input
-        df = pd.DataFrame([model_data])
+        df = pd.DataFrame(model_rows)
         
         # Apply same preprocessing as training
         df_clean = LoanDataCleaner.clean_loan_data(df)
@@ -179,29 +311,139 @@ class LoanPredictor(BasePredictor):
         string_columns_to_drop = ['purpose']
         df_processed = df_processed.drop([col for col in string_columns_to_drop if col in df_processed.columns], axis=1)
         
-        # Encode categorical variables
-        categorical_cols = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
-        existing_categorical_cols = [col for col in categorical_cols if col in df_processed.columns]
+        # Encode with the training categories and score the raw rows
+        # positionally: one matrix-vector product with the fused weights
+        probabilities = self.predict_features(self._encode(df_processed))
         
-        if existing_categorical_cols:
-            df_encoded = pd.get_dummies(df_processed, columns=existing_categorical_cols, 
-                                      prefix=existing_categorical_cols, drop_first=False)
-        else:
-            df_encoded = df_processed
+        return [self._build_prediction_result(app, float(probability))
+                for app, probability in zip(applications, probabilities)]
+    
+    def predict_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Approval probabilities for already encoded feature rows
         
-        # Ensure all training features are present
-        for feature in self.feature_names:
-            if feature not in df_encoded.columns:
-                df_encoded[feature] = 0
+        Skips the dictionary conversion and feature engineering entirely, for
+        callers that hold raw (unnormalized) rows aligned with feature_names.
         
-        # Remove any extra columns and reorder to match training
-        df_encoded = df_encoded[self.feature_names]
+        Args:
+            features: Feature row (n_features,) or matrix (m x n_features)
+            
+        Returns:
+            Approval probability per row (a 0-d array for a single row)
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet. Call train() first.")
+        
+        features = np.asarray(features, dtype=np.float64)
+        if features.shape[-1] != len(self._w_fused):
+            raise ValueError(f"Expected {len(self._w_fused)} features, got {features.shape[-1]}")
+        
+        return _sigmoid(features @ self._w_fused + self._b_fused)
+    
+    def _prepare_inference_state(self) -> None:
+        """Precompute everything single-row inference needs once the model is trained or loaded"""
+        self._build_feature_maps()
+        
+        # Fold the normalization into the weights:
+        # w . (x - mean) / std + b == x . (w / std) + (b - (w / std) . mean)
+        if self._w_fused is None or self._b_fused is None:
+            self._w_fused = np.asarray(self.model.weights, dtype=np.float64) / self.feature_stds
+            self._b_fused = float(self.model.bias - np.dot(self._w_fused, self.feature_means))
+        
+        # Contiguous float64 weights for the batch product
+        self._w_fused = np.ascontiguousarray(self._w_fused, dtype=np.float64)
+        self._b_fused = float(self._b_fused)
+        
+        self._scorer = self._compile_scorer()
+    
+    def _compile_scorer(self):
+        """
+        Generate the single-row scoring function for the trained feature layout
+        
+        Every numeric feature and one-hot column becomes one line with its
+        fused coefficient inlined, e.g. ``z += 0.0123 * float(v)``. The
+        returned function maps a feature row (see _derive_features) to the
+        logit, matching self._w_fused and self._b_fused.
+        
+        Returns:
+            Function taking the feature row dict and returning the logit
+        """
+        lines = ['def score(row):', f'    z = {float(self._b_fused)!r}']
+        namespace = {}
+        
+        # Features missing from the row contribute 0, as with the training reindex
+        for feature, idx in self._predict_index_map.items():
+            lines.append(f'    v = row.get({feature!r})')
+            lines.append('    if v is not None:')
+            lines.append(f'        z += {float(self._w_fused[idx])!r} * float(v)')
+        
+        # Unknown categories have no one-hot column and contribute 0
+        for i, col in enumerate(self._category_maps):
+            name = f'_onehot_{i}'
+            namespace[name] = {
+                str(value): float(self._w_fused[idx])
+                for value, idx in zip(self._category_maps[col], self._category_columns[col])
+            }
+            lines.append(f'    if {col!r} in row:')
+            lines.append(f'        z += {name}.get(str(row[{col!r}]), 0.0)')
+        
+        lines.append('    return z')
+        exec(compile('\n'.join(lines), '<loan_scorer>', 'exec'), namespace)
+        return namespace['score']
+    
+    def _build_feature_maps(self) -> None:
+        """Precompute where each numeric value and one-hot category lands in the feature vector"""
+        self._predict_index_map = {}
+        self._onehot_map = {}
+        
+        for idx, feature in enumerate(self.feature_names):
+            for col in _CATEGORICAL_COLS:
+                prefix = f"{col}_"
+                if feature.startswith(prefix):
+                    self._onehot_map[(col, feature[len(prefix):])] = idx
+                    break
+            else:
+                self._predict_index_map[feature] = idx
+        
+        # Categories in feature order, for encoding whole DataFrames
+        self._category_maps = {}
+        self._category_columns = {}
+        for col in _CATEGORICAL_COLS:
+            entries = [(value, idx) for (map_col, value), idx in self._onehot_map.items() if map_col == col]
+            if entries:
+                self._category_maps[col] = pd.Index([value for value, _ in entries])
+                self._category_columns[col] = np.array([idx for _, idx in entries], dtype=np.intp)
+    
+    @staticmethod
+    def _derive_features(model_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the raw (unnormalized) feature row for one application
         
-        # Normalize
-        X_norm, _, _ = DataUtils.normalize_features(df_encoded.values, self.feature_means, self.feature_stds)
+        Mirrors the feature engineering done on the training DataFrame, but
+        works on the scalar values directly. The derived features are added
+        to model_data in place, so pass a dictionary the caller owns.
         
-        # Predict
-        probability = self.model.predict_proba(X_norm)[0]
+        Args:
+            model_data: Application data in model format
+            
+        Returns:
+            model_data, now mapping every feature name to its raw value
+        """
+        row = model_data
+        
+        # Same derived features as LoanFeatureEngineer.create_aligned_features
+        if 'LoanAmount' in row:
+            row['amount'] = row['LoanAmount']
+        if 'ApplicantIncome' in row:
+            row['income'] = row['ApplicantIncome'] + row.get('CoapplicantIncome', 0)
+            row['employment_years'] = LoanFeatureEngineer._estimate_employment_years(row)
+        if 'Credit_History' in row:
+            row['credit_score'] = LoanFeatureEngineer._estimate_credit_score(row)
+        
+        return row
+    
+    def _build_prediction_result(self, loan_data: Dict[str, Any], probability: float) -> Dict[str, Any]:
+        """Turn a raw approval probability into the prediction result dictionary"""
         prediction = int(probability >= 0.5)
         
         # Generate insights
@@ -230,8 +472,8 @@ class LoanPredictor(BasePredictor):
         Returns:
             Data in model format
         """
-        # Map frontend fields to model fields
-        model_data = {}
+        # Start from the defaults for the fields the frontend doesn't collect
+        model_data = _MODEL_DEFAULTS.copy()
         
         # Direct mappings
         if 'amount' in frontend_data:
@@ -239,7 +481,6 @@ class LoanPredictor(BasePredictor):
         
         if 'income' in frontend_data:
             model_data['ApplicantIncome'] = frontend_data['income']
-            model_data['CoapplicantIncome'] = 0  # Assume no co-applicant for now
         
         if 'employment_years' in frontend_data:
             # Map employment years to loan term (simplified mapping)
@@ -249,14 +490,6 @@ class LoanPredictor(BasePredictor):
             # Map credit score to credit history (simplified)
             model_data['Credit_History'] = 1 if frontend_data['credit_score'] >= 650 else 0
         
-        # Default values for missing fields
-        model_data.setdefault('Gender', 'Male')
-        model_data.setdefault('Married', 'Yes')
-        model_data.setdefault('Dependents', 0)
-        model_data.setdefault('Education', 'Graduate')
-        model_data.setdefault('Self_Employed', 'No')
-        model_data.setdefault('Property_Area', 'Urban')
-        
         return model_data
     
     def _assess_risk_level(self, loan_data: Dict[str, Any], probability: float) -> str:
@@ -314,35 +547,75 @@ class LoanPredictor(BasePredictor):
         return recommendations
     
     def save_model(self, filepath: str) -> None:
-        """Save the trained model"""
+        """Save the trained model as a compact npz archive of float32 arrays"""
         if not self.is_trained:
             raise ValueError("No trained model to save")
         
-        model_data = {
-            'model': self.model,
-            'feature_means': self.feature_means,
-            'feature_stds': self.feature_stds,
-            'feature_names': self.feature_names,
-            'label_encoders': self.label_encoders,
-            'is_trained': self.is_trained
-        }
-        joblib.dump(model_data, filepath)
+        # Written through a file handle so numpy keeps the given path as is
+        with open(filepath, 'wb') as f:
+            np.savez_compressed(
+                f,
+                w=np.asarray(self.model.weights, dtype=np.float32),
+                b=np.float32(self.model.bias),
+                mean=np.asarray(self.feature_means, dtype=np.float32),
+                std=np.asarray(self.feature_stds, dtype=np.float32),
+                names=np.array(self.feature_names)
+            )
         super().save_model(filepath)
     
     def load_model(self, filepath: str) -> None:
-        """Load a trained model"""
-        model_data = joblib.load(filepath)
+        """
+        Load a trained model (npz archive, or a legacy joblib pickle)
+        
+        is_trained is only set once the inference state is ready, so the
+        predictor never reports trained while it can't predict yet.
+        """
+        self.is_trained = False
+        if not zipfile.is_zipfile(filepath):
+            trained = self._load_legacy_model(filepath)
+        else:
+            with np.load(filepath) as data:
+                self.model = LogisticRegression(learning_rate=0.01, max_iterations=1000)
+                self.model.weights = data['w'].astype(np.float64)
+                self.model.bias = float(data['b'])
+                self.feature_means = data['mean'].astype(np.float64)
+                self.feature_stds = data['std'].astype(np.float64)
+                self.feature_names = data['names'].tolist()
+            self.label_encoders = {}
+            self._w_fused = self._b_fused = None
+            trained = True
+        self._prepare_inference_state()
+        self.is_trained = trained
+        super().load_model(filepath)
+    
+    def _load_legacy_model(self, filepath: str) -> bool:
+        """
+        Load a model saved as a joblib pickle of the full predictor state
+        
+        The arrays are memory-mapped read-only, so workers forked after the
+        load share their pages instead of each holding a copy. Retraining
+        replaces them rather than writing into them.
+        
+        Returns:
+            The stored is_trained flag
+        """
+        model_data = joblib.load(filepath, mmap_mode='r')
         self.model = model_data['model']
         self.feature_means = model_data['feature_means']
         self.feature_stds = model_data['feature_stds']
         self.feature_names = model_data['feature_names']
         self.label_encoders = model_data.get('label_encoders', {})
-        self.is_trained = model_data['is_trained']
-        super().load_model(filepath)
+        # Older model files don't carry the fused weights; they are recomputed
+        self._w_fused = model_data.get('w_fused')
+        self._b_fused = model_data.get('b_fused')
+        return model_data['is_trained']
     
     def plot_training_history(self) -> None:
         """Plot training cost history"""
-        if not self.model.cost_history:
+        # Imported here so the API server never loads matplotlib
+        import matplotlib.pyplot as plt
+        
+        if len(self.model.cost_history) == 0:
             print("No training history available")
             return
         
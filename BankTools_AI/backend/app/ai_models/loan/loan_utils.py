@@ -3,65 +3,331 @@ Utility functions for the loan approval model
 Handles frontend form data and provides prediction services
 """
 
+from __future__ import annotations
+
 import os
+import logging
+import math
+import operator
+import threading
 import traceback
-from typing import Dict, Any, Optional, Tuple
+from functools import cache
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+import pandas as pd
+
 from .loan_model_clean import LoanPredictor
+from ..paths import model_path
+from ..shared.jit import njit, NUMBA_AVAILABLE
+from ..shared.batching import BatchingPredictor
+from ..shared.log_throttle import should_log_exception
 
-# Global model instance
-_loan_predictor = None
+if TYPE_CHECKING:
+    from typing import Dict, Any, List, Optional, Tuple, Union
 
-def _safe_log(message: str, level: str = 'info'):
-    """Safe logging that works with or without Flask context"""
-    try:
-        from flask import current_app
-        if level == 'error':
-            current_app.logger.error(message)
-        elif level == 'warning':
-            current_app.logger.warning(message)
-        else:
-            current_app.logger.info(message)
-    except (ImportError, RuntimeError):
+# A LoanPredictor that has a trained model loaded
+TrainedPredictor = LoanPredictor
+
+# Serializes the first load so concurrent requests share one predictor
+_predictor_lock = threading.Lock()
+
+# Micro-batcher set up by configure_batching(); None scores each application directly
+_batcher: Optional[BatchingPredictor] = None
+
+# Logger bound by bind_logger() (the Flask app's); None means log to stdout
+_logger: Optional[logging.Logger] = None
+_LOG_LEVELS = {'error': logging.ERROR, 'warning': logging.WARNING, 'info': logging.INFO}
+
+# Required fields for frontend form
+_REQUIRED_FIELDS = ('amount', 'purpose', 'income', 'employment_years', 'credit_score')
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+_get_required_fields = operator.itemgetter(*_REQUIRED_FIELDS)
+
+# Rule-based scoring tables: the points for a value are
+# POINTS[number of THRESHOLDS <= value], i.e. one band per threshold interval
+_CREDIT_THRESHOLDS = (600, 650, 700, 750)
+_CREDIT_POINTS = (5, 12, 20, 28, 35)
+_INCOME_THRESHOLDS = (30000, 50000, 75000, 100000)
+_INCOME_POINTS = (6, 12, 18, 22, 25)
+_EMPLOYMENT_THRESHOLDS = (1, 2, 3, 5, 10)
+_EMPLOYMENT_POINTS = (2, 6, 10, 14, 17, 20)
+# Debt-to-income bands include their upper bound: POINTS[number of THRESHOLDS < value]
+_DTI_THRESHOLDS = (0.20, 0.28, 0.36, 0.43)
+_DTI_POINTS = (15, 12, 8, 4, -5)
+_PURPOSE_SCORES = {
+    'Home Purchase': 5,
+    'Home Refinance': 4,
+    'Education': 3,
+    'Auto Loan': 2,
+    'Business Loan': 1,
+    'Debt Consolidation': 1,
+    'Personal Loan': 0,
+    'Personal/Other': -1
+}
+# Rule-based defaults for missing frontend fields
+_RULE_DEFAULTS = {
+    'credit_score': 650,
+    'income': 50000,
+    'employment_years': 2,
+    'amount': 100000,
+    'purpose': 'Personal/Other'
+}
+
+
+# Rule-based recommendation text, precomposed at import time
+_REC_CLOSE_HEADER = "Your application is close to approval. Consider these improvements:"
+_REC_CLOSE_CREDIT = "• Improve credit score (current: {}). Target: 700+"
+_REC_CLOSE_TAIL = (
+    "• Consider a co-applicant to strengthen your application",
+    "• Reduce loan amount if possible"
+)
+_REC_LOW_HEADER = "Your application needs significant improvements:"
+_REC_LOW_CREDIT = "• Substantially improve credit score (current: {})"
+_REC_LOW_TAIL = (
+    "• Increase income or reduce existing debt",
+    "• Build more employment history"
+)
+# Specific recommendations, in bit order of the weakness mask
+_REC_WEAKNESSES = (
+    "• Focus on credit improvement: pay bills on time, reduce credit utilization",
+    "• Consider increasing income through additional employment",
+    "• Build employment history - lenders prefer 2+ years stability",
+    "• Improve debt-to-income ratio by reducing loan amount or increasing income"
+)
+# Weakness mask -> tuple of matching specific recommendations
+_REC_WEAKNESS_TABLE = tuple(
+    tuple(rec for bit, rec in enumerate(_REC_WEAKNESSES) if mask >> bit & 1)
+    for mask in range(1 << len(_REC_WEAKNESSES))
+)
+_REC_APPROVED = (
+    "Congratulations! Your application meets our approval criteria.",
+    "• Prepare documentation: pay stubs, tax returns, bank statements",
+    "• Review loan terms and interest rates",
+    "• Shop around for competitive rates"
+)
+_REC_APPROVED_LOW_PROBABILITY = _REC_APPROVED + (
+    "• Consider improving credit score for better interest rates",
+)
+
+def _rule_score(credit_score: float, income: float, employment_years: float,
+                amount: float) -> Tuple[int, float]:
+    """
+    Numeric part of the rule-based score
+    
+    Returns:
+        Tuple of (score without the purpose points, debt-to-income ratio)
+    """
+    # Calculate debt-to-income ratio (approximate monthly payment)
+    monthly_income = income / 12
+    estimated_monthly_payment = (amount * 0.06) / 12  # 6% annual rate estimate
+    debt_to_income = estimated_monthly_payment / monthly_income if monthly_income > 0 else 1.0
+    
+    score = (
+        _CREDIT_POINTS[_band(_CREDIT_THRESHOLDS, credit_score)]
+        + _INCOME_POINTS[_band(_INCOME_THRESHOLDS, income)]
+        + _EMPLOYMENT_POINTS[_band(_EMPLOYMENT_THRESHOLDS, employment_years)]
+        + _DTI_POINTS[bisect_left(_DTI_THRESHOLDS, debt_to_income)
+                      if debt_to_income == debt_to_income else len(_DTI_THRESHOLDS)]
+    )
+    return score, debt_to_income
+
+
+def _band(thresholds: Tuple[float, ...], value: float) -> int:
+    """Number of thresholds <= value; NaN is in the bottom band, as in _rule_score_kernel"""
+    return bisect_right(thresholds, value) if value == value else 0
+
+
+def _bands(thresholds: Tuple[float, ...], values: np.ndarray) -> np.ndarray:
+    """Vectorized _band"""
+    return np.where(np.isnan(values), 0, np.searchsorted(thresholds, values, side='right'))
+
+
+@njit(cache=True)
+def _rule_score_kernel(credit_score, income, employment_years, amount):
+    """Compiled _rule_score; the threshold tables are folded in as constants"""
+    monthly_income = income / 12
+    estimated_monthly_payment = (amount * 0.06) / 12
+    debt_to_income = estimated_monthly_payment / monthly_income if monthly_income > 0 else 1.0
+    
+    credit_band = 0
+    for threshold in _CREDIT_THRESHOLDS:
+        credit_band += threshold <= credit_score
+    income_band = 0
+    for threshold in _INCOME_THRESHOLDS:
+        income_band += threshold <= income
+    employment_band = 0
+    for threshold in _EMPLOYMENT_THRESHOLDS:
+        employment_band += threshold <= employment_years
+    # A NaN ratio is in the worst band, like any ratio above every threshold
+    dti_band = 0 if debt_to_income == debt_to_income else len(_DTI_THRESHOLDS)
+    for threshold in _DTI_THRESHOLDS:
+        dti_band += threshold < debt_to_income
+    
+    score = (_CREDIT_POINTS[credit_band] + _INCOME_POINTS[income_band]
+             + _EMPLOYMENT_POINTS[employment_band] + _DTI_POINTS[dti_band])
+    return score, debt_to_income
+
+
+# The scalar loops only pay off compiled; plain Python uses the bisect version
+_score_kernel = _rule_score_kernel if NUMBA_AVAILABLE else _rule_score
+
+
+class PredictionResult(NamedTuple):
+    """
+    Loan prediction result
+    
+    Kept as a fixed-layout tuple through the prediction path and only turned
+    into a dictionary at the API boundary via to_dict().
+    """
+    approval_status: str
+    approval_probability: float
+    confidence_level: str
+    recommendations: List[str]
+    prediction_method: str
+    approval_prediction: Optional[int] = None
+    confidence: Optional[float] = None
+    risk_level: Optional[str] = None
+    score_breakdown: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_model_output(cls, prediction: Dict[str, Any], prediction_method: str) -> 'PredictionResult':
+        """Build a result from the dictionary returned by LoanPredictor.predict"""
+        return cls(
+            approval_status=prediction['approval_status'],
+            approval_probability=prediction['approval_probability'],
+            confidence_level=prediction['confidence_level'],
+            recommendations=prediction['recommendations'],
+            prediction_method=prediction_method,
+            approval_prediction=prediction.get('approval_prediction'),
+            confidence=prediction.get('confidence'),
+            risk_level=prediction.get('risk_level')
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary, leaving out unset optional fields"""
+        return {field: value for field, value in zip(self._fields, self) if value is not None}
+
+
+class _AppInput(NamedTuple):
+    """Typed view of a frontend loan application"""
+    credit_score: float
+    income: float
+    employment_years: float
+    amount: float
+    purpose: str
+
+
+def _parse_frontend(data: Dict[str, Any]) -> _AppInput:
+    """Parse frontend form data once, applying the rule-based defaults"""
+    get = data.get
+    return _AppInput(
+        float(get('credit_score', _RULE_DEFAULTS['credit_score'])),
+        float(get('income', _RULE_DEFAULTS['income'])),
+        float(get('employment_years', _RULE_DEFAULTS['employment_years'])),
+        float(get('amount', _RULE_DEFAULTS['amount'])),
+        str(get('purpose', _RULE_DEFAULTS['purpose']))
+    )
+
+
+def _error_result(recommendation: str, method: str = 'error_fallback',
+                  confidence_level: str = 'Low') -> PredictionResult:
+    """Build the rejected result returned when a prediction cannot be made"""
+    return PredictionResult(
+        approval_status='Rejected',
+        approval_probability=0.0,
+        confidence_level=confidence_level,
+        recommendations=[recommendation],
+        prediction_method=method
+    )
+
+def bind_logger(logger: logging.Logger) -> None:
+    """Send _safe_log output to logger; the Flask app binds its logger when it loads the models"""
+    global _logger
+    _logger = logger
+
+def configure_batching(max_wait: float) -> None:
+    """
+    Micro-batch concurrent predict_loan_approval calls within max_wait seconds
+    
+    0 turns batching off. Reconfiguring keeps the existing worker thread.
+    """
+    global _batcher
+    if max_wait <= 0:
+        _batcher = None
+    elif _batcher is None:
+        _batcher = BatchingPredictor(_predict_batch_with_loaded_model, max_wait)
+    else:
+        _batcher.max_wait = max_wait
+
+def _predict_batch_with_loaded_model(applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score a micro-batch with the cached loan predictor"""
+    predictor = get_loan_predictor()
+    if predictor is None:
+        raise RuntimeError("Loan model is not available")
+    return predictor.predict_batch(applications)
+
+def _safe_log(message: str, level: str = 'info', exc_info: bool = False):
+    """
+    Safe logging that works with or without Flask
+    
+    Logs through the logger bound by bind_logger(), and prints when none is
+    bound, so no app context lookup happens per call. When exc_info is True
+    the active exception's traceback is attached to the record, so it is
+    only formatted if the logger actually emits it. Repeats of the same
+    error within the throttle window are dropped (see log_throttle).
+    """
+    if exc_info and not should_log_exception():
+        return
+    if _logger is not None:
+        _logger.log(_LOG_LEVELS.get(level, logging.INFO), message, exc_info=exc_info)
+    else:
         print(f"[{level.upper()}] {message}")
+        if exc_info:
+            traceback.print_exc()
 
-def get_loan_predictor():
-    """Get the loan predictor instance, loading it if necessary"""
-    global _loan_predictor
+@cache
+def _load_predictor_cached(model_path: str) -> TrainedPredictor:
+    """
+    Load the trained loan predictor stored at model_path, once per path
+    
+    Failures raise instead of returning, so they are not cached and the next
+    call retries. reset_loan_predictor() drops the cached predictor.
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Loan model file not found at {model_path}")
     
-    # If we have a cached instance, use it
-    if _loan_predictor and _loan_predictor.is_trained:
-        return _loan_predictor
+    predictor = LoanPredictor()
+    predictor.load_model(model_path)
+    if not predictor.is_trained:
+        raise ValueError(f"Loan model at {model_path} is not trained")
     
-    # Load the model directly
+    _safe_log(f"Loan model loaded from {model_path}", 'info')
+    return predictor
+
+def get_loan_predictor() -> Optional[TrainedPredictor]:
+    """
+    Get the loan predictor instance, loading it if necessary
+    
+    Returns a trained predictor or None, so callers don't need to re-check
+    is_trained.
+    """
     try:
-        # Find the model file
-        try:
-            # Try Flask app context first
-            from flask import current_app
-            backend_dir = os.path.dirname(current_app.root_path)
-            models_dir = os.path.join(backend_dir, 'models')
-        except RuntimeError:
-            # No Flask context, use relative path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            backend_dir = os.path.dirname(os.path.dirname(current_dir))
-            models_dir = os.path.join(backend_dir, 'models')
-        
-        model_path = os.path.join(models_dir, 'loan_model.joblib')
-        
-        if os.path.exists(model_path):
-            _loan_predictor = LoanPredictor()
-            _loan_predictor.load_model(model_path)
-            _safe_log(f"Loan model loaded from {model_path}", 'info')
-            return _loan_predictor
-        else:
-            _safe_log(f"Loan model file not found at {model_path}", 'warning')
-            
+        with _predictor_lock:
+            return _load_predictor_cached(model_path('loan_model.joblib'))
+    except (FileNotFoundError, ValueError) as e:
+        _safe_log(str(e), 'warning')
     except Exception as e:
-        _safe_log(f"Error loading loan model: {str(e)}", 'error')
-        traceback.print_exc()
+        _safe_log(f"Error loading loan model: {str(e)}", 'error', exc_info=True)
     
     return None
 
+def reset_loan_predictor() -> None:
+    """Drop the cached loan predictor, so the next request loads the model file again"""
+    with _predictor_lock:
+        _load_predictor_cached.cache_clear()
+
 def validate_frontend_loan_data(data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
     """
     Validate loan application data from frontend form
@@ -74,34 +340,31 @@ def validate_frontend_loan_data(data: Dict[str, Any]) -> Tuple[bool, Optional[st
     """
     if not data:
         return False, "No data provided"
+    if not isinstance(data, dict):
+        return False, "Application data must be a JSON object"
     
-    # Required fields for frontend form
-    required_fields = ['amount', 'purpose', 'income', 'employment_years', 'credit_score']
-    missing_fields = [field for field in required_fields if field not in data or data[field] is None]
-    
-    if missing_fields:
+    # One C-level subset test on the key view; the ordered list of missing
+    # (absent or null) fields is only built for the error message
+    values = _get_required_fields(data) if data.keys() >= _REQUIRED_FIELD_SET else None
+    if values is None or None in values:
+        missing_fields = [field for field in _REQUIRED_FIELDS if data.get(field) is None]
         return False, f'Missing required fields: {", ".join(missing_fields)}'
     
     # Additional validation
     try:
-        amount = float(data.get('amount', 0))
-        if amount <= 0:
-            return False, "Loan amount must be greater than 0"
+        amount, purpose, income, employment_years, credit_score = values
         
-        income = float(data.get('income', 0))
-        if income <= 0:
+        if not all(math.isfinite(float(value)) for value in (amount, income, employment_years, credit_score)):
+            return False, "Numeric fields must be finite numbers"
+        if float(amount) <= 0:
+            return False, "Loan amount must be greater than 0"
+        if float(income) <= 0:
             return False, "Income must be greater than 0"
-        
-        credit_score = int(data.get('credit_score', 0))
-        if credit_score < 300 or credit_score > 850:
+        if not 300 <= int(credit_score) <= 850:
             return False, "Credit score must be between 300 and 850"
-        
-        employment_years = float(data.get('employment_years', 0))
-        if employment_years < 0:
+        if float(employment_years) < 0:
             return False, "Employment years cannot be negative"
-        
-        purpose = str(data.get('purpose', '')).strip()
-        if not purpose:
+        if not str(purpose).strip():
             return False, "Loan purpose is required"
             
     except (ValueError, TypeError) as e:
@@ -109,7 +372,7 @@ def validate_frontend_loan_data(data: Dict[str, Any]) -> Tuple[bool, Optional[st
     
     return True, None
 
-def predict_loan_approval(application_data: Dict[str, Any]) -> Dict[str, Any]:
+def predict_loan_approval(application_data: Dict[str, Any]) -> PredictionResult:
     """
     Predict loan approval using the AI model
     
@@ -122,37 +385,36 @@ def predict_loan_approval(application_data: Dict[str, Any]) -> Dict[str, Any]:
             - credit_score: Credit score
         
     Returns:
-        Prediction result dictionary
+        Prediction result
     """
     try:
+        # Validate input data before any model I/O
+        is_valid, error_message = validate_frontend_loan_data(application_data)
+        if not is_valid:
+            return _error_result(f"Data validation error: {error_message}",
+                                 'validation_error', confidence_level='High')
+        
         # Get the model
         predictor = get_loan_predictor()
         
-        if predictor and predictor.is_trained:
+        if predictor is not None:
             try:
-                # Validate input data
-                is_valid, error_message = validate_frontend_loan_data(application_data)
-                if not is_valid:
-                    return {
-                        'approval_status': 'Rejected',
-                        'approval_probability': 0.0,
-                        'confidence_level': 'High',
-                        'recommendations': [f"Data validation error: {error_message}"],
-                        'prediction_method': 'validation_error'
-                    }
-                
-                # Use the AI model for prediction
-                result = predictor.predict(application_data)
-                result['prediction_method'] = 'ai_model'
+                # Use the AI model for prediction (batched with concurrent calls when enabled)
+                batcher = _batcher
+                prediction = (batcher.predict(application_data) if batcher is not None
+                              else predictor.predict(application_data))
+                result = PredictionResult.from_model_output(prediction, 'ai_model')
                 
-                _safe_log(f"AI model prediction: {result['approval_status']} "
-                         f"(probability: {result['approval_probability']:.3f})", 'info')
+                # Hot path: one attribute check instead of a _safe_log call, and
+                # the message is only formatted if the record is emitted
+                if _logger is not None:
+                    _logger.info("AI model prediction: %s (probability: %.3f)",
+                                 result.approval_status, result.approval_probability)
                 
                 return result
                 
             except Exception as e:
-                _safe_log(f"Error using AI model: {str(e)}", 'error')
-                traceback.print_exc()
+                _safe_log(f"Error using AI model: {str(e)}", 'error', exc_info=True)
                 # Fall through to fallback prediction
         else:
             _safe_log("AI model not available, using fallback prediction", 'warning')
@@ -161,197 +423,199 @@ def predict_loan_approval(application_data: Dict[str, Any]) -> Dict[str, Any]:
         return rule_based_prediction_frontend(application_data)
         
     except Exception as e:
-        _safe_log(f"Error in loan prediction: {str(e)}", 'error')
-        traceback.print_exc()
-        return {
-            'approval_status': 'Rejected',
-            'approval_probability': 0.0,
-            'confidence_level': 'Low',
-            'recommendations': ['System error occurred. Please try again later.'],
-            'prediction_method': 'error_fallback'
-        }
+        _safe_log(f"Error in loan prediction: {str(e)}", 'error', exc_info=True)
+        return _error_result('System error occurred. Please try again later.')
 
-def rule_based_prediction_frontend(data: Dict[str, Any]) -> Dict[str, Any]:
+def predict_loan_approval_batch(applications: List[Dict[str, Any]]) -> List[PredictionResult]:
     """
-    Enhanced rule-based prediction for frontend form data
+    Predict loan approval for several applications with one model call
     
     Args:
-        data: Frontend application data
+        applications: List of frontend form data dictionaries
         
     Returns:
-        Prediction result dictionary
+        List of prediction results, in the same order as the input
     """
-    try:
-        credit_score = float(data.get('credit_score', 650))
-        income = float(data.get('income', 50000))
-        employment_years = float(data.get('employment_years', 2))
-        amount = float(data.get('amount', 100000))
-        purpose = str(data.get('purpose', 'Personal/Other'))
-        
-        # Calculate debt-to-income ratio (approximate monthly payment)
-        monthly_income = income / 12
-        estimated_monthly_payment = (amount * 0.06) / 12  # 6% annual rate estimate
-        debt_to_income = estimated_monthly_payment / monthly_income if monthly_income > 0 else 1
-        
-        # Enhanced rule-based scoring
-        score = 0
-        
-        # Credit score factor (35% weight)
-        if credit_score >= 750:
-            score += 35
-        elif credit_score >= 700:
-            score += 28
-        elif credit_score >= 650:
-            score += 20
-        elif credit_score >= 600:
-            score += 12
+    results: List[Optional[PredictionResult]] = [None] * len(applications)
+    valid_indices = []
+    
+    # Validate every application before touching the model
+    for i, application_data in enumerate(applications):
+        is_valid, error_message = validate_frontend_loan_data(application_data)
+        if is_valid:
+            valid_indices.append(i)
         else:
-            score += 5
+            results[i] = _error_result(f"Data validation error: {error_message}",
+                                       'validation_error', confidence_level='High')
+    
+    if not valid_indices:
+        return results
+    
+    valid_applications = [applications[i] for i in valid_indices]
+    predictions = None
+    
+    try:
+        predictor = get_loan_predictor()
         
-        # Income factor (25% weight)
-        if income >= 100000:
-            score += 25
-        elif income >= 75000:
-            score += 22
-        elif income >= 50000:
-            score += 18
-        elif income >= 30000:
-            score += 12
+        if predictor is not None:
+            predictions = [PredictionResult.from_model_output(prediction, 'ai_model')
+                           for prediction in predictor.predict_batch(valid_applications)]
+            
+            _safe_log(f"AI model batch prediction for {len(predictions)} applications", 'info')
         else:
-            score += 6
+            _safe_log("AI model not available, using fallback prediction", 'warning')
+            
+    except Exception as e:
+        _safe_log(f"Error using AI model for batch prediction: {str(e)}", 'error', exc_info=True)
+        predictions = None
+    
+    # Fallback to rule-based prediction
+    if predictions is None:
+        predictions = [rule_based_prediction_frontend(app) for app in valid_applications]
+    
+    for i, prediction in zip(valid_indices, predictions):
+        results[i] = prediction
+    
+    return results
+
+def rule_based_prediction_frontend(data: Dict[str, Any]) -> PredictionResult:
+    """
+    Enhanced rule-based prediction for frontend form data
+    
+    Args:
+        data: Frontend application data
         
-        # Employment stability (20% weight)
-        if employment_years >= 10:
-            score += 20
-        elif employment_years >= 5:
-            score += 17
-        elif employment_years >= 3:
-            score += 14
-        elif employment_years >= 2:
-            score += 10
-        elif employment_years >= 1:
-            score += 6
-        else:
-            score += 2
+    Returns:
+        Prediction result
+    """
+    try:
+        credit_score, income, employment_years, amount, purpose = _parse_frontend(data)
         
-        # Debt-to-income ratio (15% weight)
-        if debt_to_income <= 0.20:
-            score += 15
-        elif debt_to_income <= 0.28:
-            score += 12
-        elif debt_to_income <= 0.36:
-            score += 8
-        elif debt_to_income <= 0.43:
-            score += 4
-        else:
-            score -= 5
+        # Enhanced rule-based scoring: credit score (35% weight), income (25%),
+        # employment stability (20%) and debt-to-income ratio (15%) ...
+        score, debt_to_income = _score_kernel(credit_score, income, employment_years, amount)
+        score = int(score)
+        debt_to_income = float(debt_to_income)
         
-        # Loan purpose factor (5% weight)
-        purpose_scores = {
-            'Home Purchase': 5,
-            'Home Refinance': 4,
-            'Education': 3,
-            'Auto Loan': 2,
-            'Business Loan': 1,
-            'Debt Consolidation': 1,
-            'Personal Loan': 0,
-            'Personal/Other': -1
-        }
-        score += purpose_scores.get(purpose, 0)
+        # ... plus the loan purpose factor (5% weight)
+        score += _PURPOSE_SCORES.get(purpose, 0)
         
         # Determine approval
         approval_probability = min(0.95, max(0.05, score / 100))
         approved = score >= 65  # 65% threshold for approval
         
         # Generate recommendations
-        recommendations = []
         if not approved:
             if score >= 55:  # Close to approval
-                recommendations.extend([
-                    "Your application is close to approval. Consider these improvements:",
-                    f"• Improve credit score (current: {int(credit_score)}). Target: 700+",
-                    "• Consider a co-applicant to strengthen your application",
-                    "• Reduce loan amount if possible"
-                ])
+                header, credit_template, tail = _REC_CLOSE_HEADER, _REC_CLOSE_CREDIT, _REC_CLOSE_TAIL
             else:
-                recommendations.extend([
-                    "Your application needs significant improvements:",
-                    f"• Substantially improve credit score (current: {int(credit_score)})",
-                    "• Increase income or reduce existing debt",
-                    "• Build more employment history"
-                ])
+                header, credit_template, tail = _REC_LOW_HEADER, _REC_LOW_CREDIT, _REC_LOW_TAIL
             
             # Specific recommendations
-            if credit_score < 650:
-                recommendations.append("• Focus on credit improvement: pay bills on time, reduce credit utilization")
-            if income < 50000:
-                recommendations.append("• Consider increasing income through additional employment")
-            if employment_years < 2:
-                recommendations.append("• Build employment history - lenders prefer 2+ years stability")
-            if debt_to_income > 0.36:
-                recommendations.append("• Improve debt-to-income ratio by reducing loan amount or increasing income")
+            weakness_mask = (
+                (credit_score < 650)
+                | ((income < 50000) << 1)
+                | ((employment_years < 2) << 2)
+                | ((debt_to_income > 0.36) << 3)
+            )
+            recommendations = [header, credit_template.format(int(credit_score)), *tail,
+                               *_REC_WEAKNESS_TABLE[weakness_mask]]
+        elif approval_probability < 0.8:
+            recommendations = list(_REC_APPROVED_LOW_PROBABILITY)
         else:
-            recommendations.extend([
-                "Congratulations! Your application meets our approval criteria.",
-                "• Prepare documentation: pay stubs, tax returns, bank statements",
-                "• Review loan terms and interest rates",
-                "• Shop around for competitive rates"
-            ])
-            
-            if approval_probability < 0.8:
-                recommendations.append("• Consider improving credit score for better interest rates")
+            recommendations = list(_REC_APPROVED)
         
-        return {
-            'approval_probability': float(approval_probability),
-            'approval_prediction': int(approved),
-            'approval_status': 'Approved' if approved else 'Rejected',
-            'confidence_level': 'High' if abs(approval_probability - 0.5) > 0.3 else 'Medium' if abs(approval_probability - 0.5) > 0.15 else 'Low',
-            'recommendations': recommendations,
-            'prediction_method': 'enhanced_rule_based',
-            'score_breakdown': {
+        return PredictionResult(
+            approval_probability=float(approval_probability),
+            approval_prediction=int(approved),
+            approval_status='Approved' if approved else 'Rejected',
+            confidence_level='High' if abs(approval_probability - 0.5) > 0.3 else 'Medium' if abs(approval_probability - 0.5) > 0.15 else 'Low',
+            recommendations=recommendations,
+            prediction_method='enhanced_rule_based',
+            score_breakdown={
                 'credit_score_points': min(35, max(5, (credit_score - 300) / 550 * 35)),
                 'income_points': min(25, max(6, (income - 20000) / 80000 * 25)),
                 'employment_points': min(20, max(2, employment_years / 10 * 20)),
                 'debt_to_income_points': max(-5, min(15, (0.5 - debt_to_income) / 0.5 * 15)),
-                'purpose_points': purpose_scores.get(purpose, 0),
+                'purpose_points': _PURPOSE_SCORES.get(purpose, 0),
                 'total_score': score
             }
-        }
+        )
         
     except Exception as e:
         _safe_log(f"Error in rule-based prediction: {str(e)}", 'error')
-        return {
-            'approval_status': 'Rejected',
-            'approval_probability': 0.0,
-            'confidence_level': 'Low',
-            'recommendations': ['Error processing application. Please check your data and try again.'],
-            'prediction_method': 'error_fallback'
-        }
+        return _error_result('Error processing application. Please check your data and try again.')
 
-def format_prediction_response(prediction: Dict[str, Any], request_id: Optional[int] = None) -> Dict[str, Any]:
+def rule_based_prediction_batch(applications: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+    """
+    Score many applications with the rule-based model in one vectorized pass
+    
+    Uses the same scoring tables as rule_based_prediction_frontend, looked up
+    with np.searchsorted for whole columns at once.
+    
+    Args:
+        applications: DataFrame (or list of dictionaries) with the frontend
+            columns amount, purpose, income, employment_years and credit_score;
+            absent columns or keys get the rule-based defaults, and NaN values
+            score like they do in rule_based_prediction_frontend
+        
+    Returns:
+        Dictionary of arrays: score, approval_probability, approved and debt_to_income
+    """
+    if isinstance(applications, pd.DataFrame):
+        df = applications.assign(**{col: default for col, default in _RULE_DEFAULTS.items()
+                                    if col not in applications.columns})
+    else:
+        df = pd.DataFrame([{**_RULE_DEFAULTS, **app} for app in applications], columns=list(_RULE_DEFAULTS))
+    credit_score, income, employment_years, amount = (
+        df[col].to_numpy(dtype=np.float64) for col in ('credit_score', 'income', 'employment_years', 'amount'))
+    
+    # Debt-to-income ratio (approximate monthly payment at a 6% annual rate)
+    monthly_income = income / 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        debt_to_income = np.where(monthly_income > 0, (amount * 0.06) / 12 / monthly_income, 1.0)
+    
+    # searchsorted sorts NaN last, so a NaN ratio already lands in the worst DTI band
+    score = (
+        np.take(_CREDIT_POINTS, _bands(_CREDIT_THRESHOLDS, credit_score))
+        + np.take(_INCOME_POINTS, _bands(_INCOME_THRESHOLDS, income))
+        + np.take(_EMPLOYMENT_POINTS, _bands(_EMPLOYMENT_THRESHOLDS, employment_years))
+        + np.take(_DTI_POINTS, np.searchsorted(_DTI_THRESHOLDS, debt_to_income, side='left'))
+        + df['purpose'].astype(str).map(_PURPOSE_SCORES).fillna(0).to_numpy(dtype=np.int64)
+    )
+    
+    return {
+        'score': score,
+        'approval_probability': np.clip(score / 100, 0.05, 0.95),
+        'approved': score >= 65,
+        'debt_to_income': debt_to_income
+    }
+
+def format_prediction_response(prediction: PredictionResult, request_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Format prediction response for API consistency
     
     Args:
-        prediction: Raw prediction result from model
+        prediction: Prediction result from the model or the rule-based fallback
         request_id: Optional request ID for tracking
         
     Returns:
         Formatted response dictionary
     """
+    # Plain Python primitives only, so the JSON encoder stays on its fast path
     response = {
         'success': True,
         'prediction': {
-            'approval_status': prediction['approval_status'],
-            'approval_probability': round(prediction['approval_probability'], 3),
-            'confidence_level': prediction['confidence_level'],
-            'recommendations': prediction['recommendations']
+            'approval_status': str(prediction.approval_status),
+            'approval_probability': round(float(prediction.approval_probability), 3),
+            'confidence_level': str(prediction.confidence_level),
+            'recommendations': [str(rec) for rec in prediction.recommendations]
         },
         'model_info': {
-            'prediction_method': prediction.get('prediction_method', 'unknown'),
-            'model_available': prediction.get('prediction_method') == 'ai_model',
-            'selected_features': prediction.get('selected_features_used', []),
-            'model_type': prediction.get('model_type', 'Unknown')
+            'prediction_method': str(prediction.prediction_method),
+            'model_available': prediction.prediction_method == 'ai_model',
+            'selected_features': [],
+            'model_type': 'Unknown'
         }
     }
     
@@ -359,13 +623,13 @@ def format_prediction_response(prediction: Dict[str, Any], request_id: Optional[
         response['request_id'] = request_id
     
     # Add score breakdown if available (from rule-based prediction)
-    if 'score_breakdown' in prediction:
-        response['score_breakdown'] = prediction['score_breakdown']
+    if prediction.score_breakdown is not None:
+        response['score_breakdown'] = prediction.score_breakdown
     
     return response
 
 # Backward compatibility function
-def predict_loan_approval_unified(application_data: Dict[str, Any], use_simple_format: bool = True) -> Dict[str, Any]:
+def predict_loan_approval_unified(application_data: Dict[str, Any], use_simple_format: bool = True) -> PredictionResult:
     """
     Unified prediction function that works with both old and new systems
     
@@ -385,13 +649,11 @@ def predict_loan_approval_unified(application_data: Dict[str, Any], use_simple_f
         try:
             # Try to use the model anyway
             predictor = get_loan_predictor()
-            if predictor and predictor.is_trained:
+            if predictor is not None:
                 # The model can handle both formats
-                result = predictor.predict(application_data)
-                result['prediction_method'] = 'ai_model_legacy'
-                return result
+                return PredictionResult.from_model_output(predictor.predict(application_data), 'ai_model_legacy')
         except Exception as e:
-            _safe_log(f"Error using model with legacy format: {str(e)}", 'warning')
+            _safe_log(f"Error using model with legacy format: {str(e)}", 'warning', exc_info=True)
         
         # Fallback to rule-based for legacy format
         return rule_based_prediction_frontend(application_data) 
\ No newline at end of file
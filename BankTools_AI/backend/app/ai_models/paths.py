@@ -0,0 +1,27 @@
+"""
+Locations of the trained model files and training datasets
+
+Every model file lives in backend/models/ and every dataset in
+BankTools_AI/datasets/. The directories are derived from this module's
+location, so they resolve the same with or without a Flask app context.
+"""
+
+import os
+from functools import cache
+
+# backend/, two levels above app/ai_models/
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODELS_DIR = os.path.join(_BACKEND_DIR, 'models')
+DATASETS_DIR = os.path.join(os.path.dirname(_BACKEND_DIR), 'datasets')
+
+
+@cache
+def model_path(name: str) -> str:
+    """Absolute path of the model file name (e.g. 'loan_model.joblib') in MODELS_DIR"""
+    return os.path.join(MODELS_DIR, name)
+
+
+def dataset_path(name: str) -> str:
+    """Absolute path of the dataset file name (e.g. 'Churn_Modelling.csv') in DATASETS_DIR"""
+    return os.path.join(DATASETS_DIR, name)
@@ -3,16 +3,24 @@ Flask routes for AI model predictions
 Provides API endpoints for churn prediction and loan approval
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, current_app
 from flask_login import login_required, current_user
 import os
-import traceback
 from .churn.churn_model_clean import ChurnPredictor
-from .loan.loan_model_clean import LoanPredictor
+from .paths import model_path
+from .training import submit_training, training_status
+from .shared.batching import BatchingPredictor
+from .shared.log_throttle import should_log_exception
+from ..json_provider import json_response as _json_response
 from .loan.loan_utils import (
     validate_frontend_loan_data,
     predict_loan_approval,
-    format_prediction_response
+    predict_loan_approval_batch,
+    format_prediction_response,
+    get_loan_predictor,
+    reset_loan_predictor,
+    configure_batching as configure_loan_batching,
+    bind_logger
 )
 
 ai_models = Blueprint('ai_models', __name__)
@@ -21,37 +29,108 @@ ai_models = Blueprint('ai_models', __name__)
 churn_predictor = None
 loan_predictor = None
 
+# Serialized /model-status response; rebuilt whenever the models are (re)loaded
+_model_status_payload = None
+
+# Micro-batcher for single churn predictions; None scores each request directly
+_churn_batcher = None
+
+# Upper bound on applications accepted by the batch loan endpoint
+MAX_LOAN_BATCH_SIZE = 1000
+
+# Upper bound on customers accepted by the batch churn endpoint
+MAX_CHURN_BATCH_SIZE = 1000
+
+# Fields every churn prediction request must provide
+CHURN_REQUIRED_FIELDS = ('CreditScore', 'Geography', 'Gender', 'Age', 'Tenure',
+                         'Balance', 'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary')
+_CHURN_REQUIRED_FIELD_SET = frozenset(CHURN_REQUIRED_FIELDS)
+
 def load_models():
-    """Load trained models on app startup"""
-    global churn_predictor, loan_predictor
+    """
+    Load trained models on app startup
+    
+    Runs from create_app, so the models are warm before the first request.
+    The loan predictor goes through the cache that the prediction helpers
+    read, so requests never load it themselves. Under a pre-forking server,
+    create the app before forking (e.g. gunicorn --preload) so the models
+    are loaded once and shared by the workers.
+    """
+    global churn_predictor, loan_predictor, _model_status_payload
+    
+    # Prediction helpers log through the app logger from now on
+    bind_logger(current_app.logger)
+    _configure_batching(current_app.config.get('MODEL_BATCH_WINDOW_MS', 0) / 1000)
     
     try:
-        # Get the correct path to the models directory (backend/models/)
-        # Go up from app directory to backend, then into models
-        backend_dir = os.path.dirname(current_app.root_path)
-        models_dir = os.path.join(backend_dir, 'models')
-        
-        # Load churn model
-        churn_model_path = os.path.join(models_dir, 'churn_model.joblib')
+        # Load churn model (model files live in backend/models/)
+        churn_model_path = model_path('churn_model.joblib')
         if os.path.exists(churn_model_path):
-            churn_predictor = ChurnPredictor()
-            churn_predictor.load_model(churn_model_path)
+            # Loaded into a local first: requests keep using the current
+            # predictor until the new one is fully ready (or the load fails)
+            predictor = ChurnPredictor()
+            predictor.load_model(churn_model_path)
+            churn_predictor = predictor
             print("Churn model loaded successfully")
         else:
             print(f"Churn model not found at {churn_model_path}")
             
-        # Load loan model
-        loan_model_path = os.path.join(models_dir, 'loan_model.joblib')
-        if os.path.exists(loan_model_path):
-            loan_predictor = LoanPredictor()
-            loan_predictor.load_model(loan_model_path)
+        # Load loan model (warns and returns None when the file is missing)
+        loan_predictor = get_loan_predictor()
+        if loan_predictor is not None:
             print("Loan model loaded successfully")
-        else:
-            print(f"Loan model not found at {loan_model_path}")
             
     except Exception as e:
-        print(f"Error loading models: {str(e)}")
-        traceback.print_exc()
+        current_app.logger.exception("Error loading models: %s", e)
+    
+    _model_status_payload = _build_model_status_payload()
+
+def _build_model_status_payload() -> str:
+    """Serialize the /model-status response for the currently loaded models"""
+    loan_loaded = loan_predictor is not None and loan_predictor.is_trained
+    status = {
+        'churn_model': {
+            'loaded': churn_predictor is not None and churn_predictor.is_trained,
+            'type': 'ChurnPredictor' if churn_predictor else None
+        },
+        'loan_model': {
+            'loaded': loan_loaded,
+            'type': 'LoanPredictor' if loan_predictor else None,
+            'selected_features': list(loan_predictor.feature_names) if loan_loaded else None
+        }
+    }
+    return current_app.json.dumps({
+        'success': True,
+        'models': status
+    })
+
+def _configure_batching(max_wait: float) -> None:
+    """Micro-batch single predictions within max_wait seconds (0 disables); reloads reuse the workers"""
+    global _churn_batcher
+    configure_loan_batching(max_wait)
+    if max_wait <= 0:
+        _churn_batcher = None
+    elif _churn_batcher is None:
+        _churn_batcher = BatchingPredictor(_predict_churn_batch, max_wait)
+    else:
+        _churn_batcher.max_wait = max_wait
+
+def _predict_churn_batch(customers: list) -> list:
+    """Score a micro-batch with whichever churn predictor is currently loaded"""
+    return churn_predictor.predict_batch(customers)
+
+def _missing_churn_fields(customer_data) -> list:
+    """Required churn fields absent from customer_data, in CHURN_REQUIRED_FIELDS order"""
+    if not isinstance(customer_data, dict):
+        return list(CHURN_REQUIRED_FIELDS)
+    # One set difference against the key view; nothing is allocated for valid input
+    missing = _CHURN_REQUIRED_FIELD_SET - customer_data.keys()
+    return [field for field in CHURN_REQUIRED_FIELDS if field in missing] if missing else []
+
+def _log_exception(message: str, *args) -> None:
+    """Log the exception being handled with its traceback, once per identical error per window"""
+    if should_log_exception():
+        current_app.logger.exception(message, *args)
 
 def create_blueprint():
     """Create and return the AI models blueprint"""
@@ -79,54 +158,147 @@ def predict_churn():
     try:
         # Check if user has permission (banking employees only)
         if current_user.role != 'banking_employee':
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Access denied. Only banking employees can access churn analysis.'
-            }), 403
+            }, 403)
         
         # Check if model is loaded
         if churn_predictor is None or not churn_predictor.is_trained:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Churn prediction model is not available. Please contact administrator.'
-            }), 503
+            }, 503)
         
         # Get customer data from request
         customer_data = request.get_json()
         
         if not customer_data:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'No customer data provided'
-            }), 400
+            }, 400)
         
         # Validate required fields
-        required_fields = ['CreditScore', 'Geography', 'Gender', 'Age', 'Tenure', 
-                          'Balance', 'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary']
-        
-        missing_fields = [field for field in required_fields if field not in customer_data]
+        missing_fields = _missing_churn_fields(customer_data)
         if missing_fields:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': f'Missing required fields: {", ".join(missing_fields)}'
-            }), 400
+            }, 400)
         
-        # Make prediction
-        prediction = churn_predictor.predict(customer_data)
+        # Make prediction (batched with concurrent requests when micro-batching is on)
+        batcher = _churn_batcher
+        prediction = batcher.predict(customer_data) if batcher is not None else churn_predictor.predict(customer_data)
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'prediction': prediction,
             'customer_data': customer_data
         })
         
     except Exception as e:
-        current_app.logger.error(f"Error in churn prediction: {str(e)}")
-        traceback.print_exc()
-        return jsonify({
+        _log_exception("Error in churn prediction: %s", e)
+        return _json_response({
             'success': False,
             'error': 'Internal server error during prediction'
-        }), 500
+        }, 500)
+
+@ai_models.route('/predict-churn/batch', methods=['POST'])
+@login_required
+def predict_churn_batch():
+    """
+    Predict churn probability for several customers in one request
+    Expected JSON format:
+    {
+        "customers": [
+            {
+                "CreditScore": 650,
+                "Geography": "France",
+                ...
+            },
+            ...
+        ]
+    }
+    Customers with missing fields get a per-customer error entry.
+    """
+    try:
+        # Check if user has permission (banking employees only)
+        if current_user.role != 'banking_employee':
+            return _json_response({
+                'success': False,
+                'error': 'Access denied. Only banking employees can access churn analysis.'
+            }, 403)
+        
+        # Check if model is loaded
+        if churn_predictor is None or not churn_predictor.is_trained:
+            return _json_response({
+                'success': False,
+                'error': 'Churn prediction model is not available. Please contact administrator.'
+            }, 503)
+        
+        data = request.get_json()
+        customers = data.get('customers') if isinstance(data, dict) else None
+        
+        if not isinstance(customers, list) or not customers:
+            return _json_response({
+                'success': False,
+                'error': 'No customer data provided'
+            }, 400)
+        
+        if len(customers) > MAX_CHURN_BATCH_SIZE:
+            return _json_response({
+                'success': False,
+                'error': f'Too many customers. Maximum batch size is {MAX_CHURN_BATCH_SIZE}'
+            }, 400)
+        
+        # Validate every customer before touching the model
+        predictions = [None] * len(customers)
+        valid_indices = []
+        for i, customer_data in enumerate(customers):
+            if not isinstance(customer_data, dict):
+                predictions[i] = {
+                    'success': False,
+                    'error': 'Customer data must be a JSON object',
+                    'customer_data': customer_data
+                }
+                continue
+            
+            missing_fields = _missing_churn_fields(customer_data)
+            if missing_fields:
+                predictions[i] = {
+                    'success': False,
+                    'error': f'Missing required fields: {", ".join(missing_fields)}',
+                    'customer_data': customer_data
+                }
+            else:
+                valid_indices.append(i)
+        
+        # Score all valid customers with a single model call
+        if valid_indices:
+            valid_customers = [customers[i] for i in valid_indices]
+            for i, prediction in zip(valid_indices, churn_predictor.predict_batch(valid_customers)):
+                predictions[i] = {
+                    'success': True,
+                    'prediction': prediction,
+                    'customer_data': customers[i]
+                }
+        
+        current_app.logger.info("Batch churn prediction for user %s: %d customers",
+                                current_user.id, len(predictions))
+        
+        return _json_response({
+            'success': True,
+            'count': len(predictions),
+            'predictions': predictions
+        })
+        
+    except Exception as e:
+        _log_exception("Error in batch churn prediction: %s", e)
+        return _json_response({
+            'success': False,
+            'error': 'Internal server error during batch prediction'
+        }, 500)
 
 @ai_models.route('/predict-loan', methods=['POST'])
 @login_required
@@ -145,10 +317,10 @@ def predict_loan():
     try:
         # Check if user has permission (banking users only)
         if current_user.role != 'banking_user':
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Access denied. Only bank customers can access loan prediction.'
-            }), 403
+            }, 403)
         
         # Get applicant data from request
         applicant_data = request.get_json()
@@ -156,10 +328,10 @@ def predict_loan():
         # Validate input data using validation
         is_valid, error_message = validate_frontend_loan_data(applicant_data)
         if not is_valid:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': error_message
-            }), 400
+            }, 400)
         
         # Use prediction system
         prediction_result = predict_loan_approval(applicant_data)
@@ -168,74 +340,167 @@ def predict_loan():
         response = format_prediction_response(prediction_result)
         response['applicant_data'] = applicant_data
         
-        current_app.logger.info(f"Loan prediction for user {current_user.id}: "
-                              f"{prediction_result['approval_status']} using {prediction_result['prediction_method']}")
+        current_app.logger.info("Loan prediction for user %s: %s using %s", current_user.id,
+                                prediction_result.approval_status, prediction_result.prediction_method)
         
-        return jsonify(response)
+        return _json_response(response)
         
     except Exception as e:
-        current_app.logger.error(f"Error in loan prediction: {str(e)}")
-        traceback.print_exc()
-        return jsonify({
+        _log_exception("Error in loan prediction: %s", e)
+        return _json_response({
             'success': False,
             'error': 'Internal server error during prediction'
-        }), 500
+        }, 500)
+
+@ai_models.route('/predict-loan/batch', methods=['POST'])
+@login_required
+def predict_loan_batch():
+    """
+    Predict loan approval for several applications in one request
+    Expected JSON format:
+    {
+        "applications": [
+            {
+                "amount": 150000,
+                "purpose": "Home Purchase",
+                "income": 75000,
+                "employment_years": 5,
+                "credit_score": 720
+            },
+            ...
+        ]
+    }
+    """
+    try:
+        # Check if user has permission (banking employees only)
+        if current_user.role != 'banking_employee':
+            return _json_response({
+                'success': False,
+                'error': 'Access denied. Only banking employees can run batch loan prediction.'
+            }, 403)
+        
+        data = request.get_json()
+        applications = data.get('applications') if isinstance(data, dict) else None
+        
+        if not isinstance(applications, list) or not applications:
+            return _json_response({
+                'success': False,
+                'error': 'No loan applications provided'
+            }, 400)
+        
+        if len(applications) > MAX_LOAN_BATCH_SIZE:
+            return _json_response({
+                'success': False,
+                'error': f'Too many applications. Maximum batch size is {MAX_LOAN_BATCH_SIZE}'
+            }, 400)
+        
+        # Score all applications with a single model call
+        prediction_results = predict_loan_approval_batch(applications)
+        
+        predictions = []
+        for applicant_data, prediction_result in zip(applications, prediction_results):
+            response = format_prediction_response(prediction_result)
+            response['applicant_data'] = applicant_data
+            predictions.append(response)
+        
+        current_app.logger.info("Batch loan prediction for user %s: %d applications",
+                                current_user.id, len(predictions))
+        
+        return _json_response({
+            'success': True,
+            'count': len(predictions),
+            'predictions': predictions
+        })
+        
+    except Exception as e:
+        _log_exception("Error in batch loan prediction: %s", e)
+        return _json_response({
+            'success': False,
+            'error': 'Internal server error during batch prediction'
+        }, 500)
 
 @ai_models.route('/model-status', methods=['GET'])
 @login_required
 def model_status():
     """Get the status of loaded models"""
+    global _model_status_payload
+    
     try:
-        status = {
-            'churn_model': {
-                'loaded': churn_predictor is not None and churn_predictor.is_trained,
-                'type': 'ChurnPredictor' if churn_predictor else None
-            },
-            'loan_model': {
-                'loaded': loan_predictor is not None and loan_predictor.is_trained,
-                'type': 'LoanPredictor' if loan_predictor else None,
-                'selected_features': loan_predictor.selected_features if loan_predictor and loan_predictor.is_trained else None
-            }
-        }
+        # Only changes when the models are (re)loaded, so it is serialized once
+        if _model_status_payload is None:
+            _model_status_payload = _build_model_status_payload()
         
-        return jsonify({
-            'success': True,
-            'models': status
-        })
+        return current_app.response_class(_model_status_payload, mimetype='application/json')
         
     except Exception as e:
         current_app.logger.error(f"Error getting model status: {str(e)}")
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': 'Error retrieving model status'
-        }), 500
+        }, 500)
 
 @ai_models.route('/train-models', methods=['POST'])
 @login_required
 def train_models():
     """
     Endpoint to trigger model training (admin only)
-    This should be used carefully as it will retrain models
+    
+    Queues a retrain of both models in the background training worker and
+    returns 202 with a task id right away; the retrained models are loaded
+    as soon as the job finishes. Poll /train-status/<task_id> for progress.
     """
     try:
         # Check if user is admin/employee
         if current_user.role != 'banking_employee':
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Access denied. Only banking employees can trigger model training.'
-            }), 403
+            }, 403)
+        
+        task_id = submit_training(_reload_models_when_done(current_app._get_current_object()))
         
-        # This is a placeholder for model training
-        # In production, you might want to run this as a background task
-        return jsonify({
+        return _json_response({
             'success': True,
             'message': 'Model training initiated. This process may take several minutes.',
-            'note': 'Please run the model training scripts manually: python train_churn_model.py and python train_loan_model.py'
-        })
+            'task_id': task_id
+        }, 202)
         
     except Exception as e:
         current_app.logger.error(f"Error in model training endpoint: {str(e)}")
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': 'Error initiating model training'
-        }), 500 
\ No newline at end of file
+        }, 500)
+
+@ai_models.route('/train-status/<task_id>', methods=['GET'])
+@login_required
+def train_status(task_id):
+    """Report the state of a training job started by /train-models (admin only)"""
+    if current_user.role != 'banking_employee':
+        return _json_response({
+            'success': False,
+            'error': 'Access denied. Only banking employees can view model training.'
+        }, 403)
+    
+    status = training_status(task_id)
+    if status is None:
+        return _json_response({
+            'success': False,
+            'error': 'Unknown training task'
+        }, 404)
+    
+    return _json_response({
+        'success': True,
+        'task_id': task_id,
+        **status
+    })
+
+def _reload_models_when_done(app):
+    """Done-callback that loads the retrained model files once a training job succeeds"""
+    def reload_models(future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with app.app_context():
+            reset_loan_predictor()
+            load_models()
+    return reload_models
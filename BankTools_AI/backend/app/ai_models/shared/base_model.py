@@ -2,13 +2,125 @@
 Base model class with common functionality for AI models
 """
 
+import math
+import inspect
+import logging
 import numpy as np
-import pandas as pd
 import joblib
-import matplotlib.pyplot as plt
-from typing import Dict, Any, Tuple, Optional
+from scipy.optimize import minimize
+from scipy.special import expit
+from typing import Dict, Any, List, Tuple, Optional
 from abc import ABC, abstractmethod
 
+from .jit import njit, prange, NUMBA_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+# Row chunks the JIT training kernel reduces over; fixed so results don't depend on the thread count
+_GD_CHUNKS = 16
+
+# Between logged costs, training stops once the largest gradient entry is below tolerance times this
+_GRAD_STOP_FACTOR = 10.0
+
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _gd_kernel(X, y, sample_weights, weights, bias, learning_rate, max_iterations, tolerance,
+               log_every, cost_history):
+    """
+    Full-batch gradient descent for logistic regression in one fused loop
+    
+    Each iteration computes the logits, the sample-weighted gradient and
+    (every log_every iterations) the weighted cross-entropy in a single pass
+    over the rows, in parallel over fixed row chunks. The iterations that
+    skip the cost check convergence on the gradient instead. weights and
+    cost_history are updated in place.
+    
+    Returns:
+        Final bias, number of iterations run, and whether training converged
+    """
+    m, n = X.shape
+    n_chunks = min(_GD_CHUNKS, m)
+    partial_dw = np.zeros((n_chunks, n))
+    partial_db = np.zeros(n_chunks)
+    partial_cost = np.zeros(n_chunks)
+    prev_cost = np.inf
+    
+    for it in range(max_iterations):
+        log_cost = it % log_every == 0
+        for c in prange(n_chunks):
+            start = c * m // n_chunks
+            stop = (c + 1) * m // n_chunks
+            dw = partial_dw[c]
+            dw[:] = 0.0
+            db = 0.0
+            cost = 0.0
+            for i in range(start, stop):
+                z = bias
+                for j in range(n):
+                    z += X[i, j] * weights[j]
+                sw = sample_weights[i]
+                # Stable log(1 + e^z) and sigmoid(z), with no overflow for large |z|
+                if z >= 0.0:
+                    e = math.exp(-z)
+                    if log_cost:
+                        cost += sw * (z + math.log1p(e) - y[i] * z)
+                    p = 1.0 / (1.0 + e)
+                else:
+                    e = math.exp(z)
+                    if log_cost:
+                        cost += sw * (math.log1p(e) - y[i] * z)
+                    p = e / (1.0 + e)
+                r = (p - y[i]) * sw
+                for j in range(n):
+                    dw[j] += r * X[i, j]
+                db += r
+            partial_db[c] = db
+            partial_cost[c] = cost
+        
+        converged = False
+        if log_cost:
+            cost = partial_cost.sum() / m
+            cost_history[it // log_every] = cost
+            # Average change per iteration since the previous logged cost
+            converged = abs(prev_cost - cost) / log_every < tolerance
+            prev_cost = cost
+        
+        grad_max = 0.0
+        for j in range(n):
+            g = partial_dw[:, j].sum() / m
+            weights[j] -= learning_rate * g
+            grad_max = max(grad_max, abs(g))
+        g = partial_db.sum() / m
+        bias -= learning_rate * g
+        grad_max = max(grad_max, abs(g))
+        
+        if not log_cost and grad_max < tolerance * _GRAD_STOP_FACTOR:
+            converged = True
+        
+        if converged:
+            return bias, it + 1, True
+    
+    return bias, max_iterations, False
+
+
+def _bce_from_logits(logits: np.ndarray, y: np.ndarray, sample_weights: np.ndarray = None) -> float:
+    """
+    Mean (optionally sample-weighted) cross-entropy computed from the logits
+    
+    Uses log(1 + e^z) = max(z, 0) + log1p(e^-|z|), which never overflows and
+    needs no clipping; every step runs in place on one buffer with SIMD
+    exp/log1p loops. The mean is accumulated in float64.
+    """
+    losses = np.abs(logits)
+    np.negative(losses, out=losses)
+    np.exp(losses, out=losses)
+    np.log1p(losses, out=losses)
+    losses += np.maximum(logits, 0)
+    losses -= y * logits
+    if sample_weights is not None:
+        losses *= sample_weights
+    return float(np.mean(losses, dtype=np.float64))
+
 
 class BasePredictor(ABC):
     """
@@ -19,6 +131,11 @@ class BasePredictor(ABC):
         self.is_trained = False
         self.feature_names = None
         
+    @abstractmethod
+    def load_and_preprocess_data(self, filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Load a dataset as the feature matrix and target vector"""
+        pass
+    
     @abstractmethod
     def train(self, filepath: str) -> Dict[str, Any]:
         """Train the model"""
@@ -29,6 +146,64 @@ class BasePredictor(ABC):
         """Make predictions"""
         pass
     
+    def cross_validate(self, filepath: str, k: int = 5, n_jobs: int = -1) -> Dict[str, Any]:
+        """
+        Estimate performance with k-fold cross-validation, training the folds in parallel
+        
+        The data is loaded by a fresh predictor, so this one is left untouched.
+        Every fold trains a new model with the hyperparameters of self.model on
+        its own normalization statistics; the folds run in joblib worker processes.
+        
+        Args:
+            filepath: Path to the CSV file
+            k: Number of folds
+            n_jobs: Number of worker processes (-1 for one per CPU core)
+            
+        Returns:
+            Mean of each metric across the folds, and the per-fold metrics
+        """
+        X, y = type(self)().load_and_preprocess_data(filepath)
+        
+        folds = np.array_split(np.random.permutation(len(X)), k)
+        params = self.model.get_params()
+        fold_metrics = joblib.Parallel(n_jobs=n_jobs, prefer='processes')(
+            joblib.delayed(_fit_fold)(params, X, y, np.concatenate(folds[:i] + folds[i + 1:]), folds[i])
+            for i in range(k)
+        )
+        
+        mean_metrics = {
+            metric: float(np.mean([fold[metric] for fold in fold_metrics]))
+            for metric in fold_metrics[0] if metric != 'confusion_matrix'
+        }
+        return {'mean': mean_metrics, 'folds': fold_metrics}
+    
+    def _evaluate_model(self, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+        """Evaluate model performance"""
+        return self._evaluate_splits((X, y))[0]
+    
+    def _evaluate_splits(self, *splits: Tuple[np.ndarray, np.ndarray]) -> List[Dict[str, float]]:
+        """
+        Evaluate model performance on several (X, y) splits with one forward pass
+        
+        The splits are stacked so the model computes all logits in one matrix
+        product; labels and log loss for each split come from its slice.
+        
+        Returns:
+            One metrics dictionary per split, in order
+        """
+        X_all = np.concatenate([X for X, _ in splits]) if len(splits) > 1 else splits[0][0]
+        logits = self.model.predict_logits(X_all)
+        predictions = (logits >= 0).astype(np.int8)
+        
+        metrics = []
+        start = 0
+        for X, y in splits:
+            stop = start + len(X)
+            metrics.append(ModelEvaluator.evaluate_binary_classification(
+                y, predictions[start:stop], logits=logits[start:stop]))
+            start = stop
+        return metrics
+    
     def save_model(self, filepath: str) -> None:
         """Save the trained model - to be implemented by subclasses"""
         if not self.is_trained:
@@ -45,27 +220,88 @@ class LogisticRegression:
     Custom Logistic Regression implementation from scratch using numpy
     """
     
-    def __init__(self, learning_rate: float = 0.01, max_iterations: int = 1000, tolerance: float = 1e-6):
+    OPTIMIZERS = ('gd', 'momentum', 'adam', 'lbfgs')
+    # Adam second-moment decay and denominator epsilon
+    ADAM_BETA2 = 0.999
+    ADAM_EPSILON = 1e-8
+    
+    def __init__(self, learning_rate: float = 0.01, max_iterations: int = 1000, tolerance: float = 1e-6,
+                 batch_size: Optional[int] = None, optimizer: str = 'gd', beta: float = 0.9,
+                 log_cost_every: int = 1, random_state: Optional[int] = None, verbose: bool = False):
         """
         Initialize the logistic regression model
         
         Args:
             learning_rate: Learning rate for gradient descent
-            max_iterations: Maximum number of iterations
+            max_iterations: Maximum number of iterations (epochs when batch_size is set)
             tolerance: Convergence tolerance
+            batch_size: Mini-batch size for SGD in fit (None for full-batch gradient descent;
+                fit_weighted is full-batch only and rejects a batch size)
+            optimizer: Update rule used by fit and fit_weighted: 'gd' (plain),
+                'momentum' or 'adam'; 'lbfgs' minimizes the full-batch loss with
+                scipy's L-BFGS-B instead (learning_rate and batch_size are unused)
+            beta: Momentum decay (the first-moment decay for Adam)
+            log_cost_every: Compute, record and check the cost for convergence every
+                this many iterations; the other iterations skip the cost pass and
+                (full-batch only) stop once no gradient entry exceeds 10 * tolerance
+            random_state: Seed for the generator used for weight init and shuffling
+            verbose: Log training progress (cost every 100 iterations, convergence)
+                at INFO level; off by default so training does no output I/O
         """
+        if optimizer not in self.OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer '{optimizer}', expected one of {self.OPTIMIZERS}")
+        
         self.learning_rate = learning_rate
         self.max_iterations = max_iterations
         self.tolerance = tolerance
+        self.batch_size = batch_size
+        self.optimizer = optimizer
+        self.beta = beta
+        self.log_cost_every = max(1, log_cost_every)
+        self.random_state = random_state
+        self.verbose = verbose
+        self.rng = np.random.default_rng(random_state)
         self.weights = None
         self.bias = None
-        self.cost_history = []
+        self.cost_history = np.empty(0, dtype=np.float32)
+        self.n_iter_ = 0
+        
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled model, filling in attributes older model files lack
         
+        Legacy joblib files only carry the original learning_rate /
+        max_iterations / tolerance; every later constructor argument gets its
+        default so get_params, cloning and retraining work on them.
+        """
+        self.__dict__.update(state)
+        for name, param in inspect.signature(LogisticRegression.__init__).parameters.items():
+            if name != 'self' and name not in state:
+                setattr(self, name, param.default)
+        if 'rng' not in state:
+            self.rng = np.random.default_rng(self.random_state)
+        if 'n_iter_' not in state:
+            self.n_iter_ = 0
+    
+    def get_params(self) -> Dict[str, Any]:
+        """Constructor arguments of this model, for training a fresh copy"""
+        return {
+            'learning_rate': self.learning_rate,
+            'max_iterations': self.max_iterations,
+            'tolerance': self.tolerance,
+            'batch_size': self.batch_size,
+            'optimizer': self.optimizer,
+            'beta': self.beta,
+            'log_cost_every': self.log_cost_every,
+            'random_state': self.random_state,
+            'verbose': self.verbose
+        }
+    
     def sigmoid(self, z: np.ndarray) -> np.ndarray:
-        """Sigmoid activation function with clipping to prevent overflow"""
-        z = np.asarray(z, dtype=np.float64)
-        z = np.clip(z, -500, 500)  # Prevent overflow
-        return 1 / (1 + np.exp(-z))
+        """Sigmoid activation function (scipy's expit saturates without overflowing)"""
+        z = np.asarray(z)
+        # float32 scores stay float32; anything else is computed in float64
+        return expit(z if z.dtype == np.float32 else z.astype(np.float64))
     
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
         """
@@ -75,128 +311,373 @@ class LogisticRegression:
             X: Feature matrix (m x n)
             y: Target vector (m,)
         """
-        X = np.asarray(X, dtype=np.float64)
-        y = np.asarray(y, dtype=np.float64)
+        # float32 halves the bytes each matrix-vector product streams;
+        # the cost is still accumulated in float64
+        dtype = np.float32
+        X = np.ascontiguousarray(X, dtype=dtype)
+        y = np.asarray(y, dtype=dtype)
         m, n = X.shape
         
-        # Initialize weights and bias
-        self.weights = np.random.normal(0, 0.01, n).astype(np.float64)
+        # Initialize weights (Xavier scaling) and bias
+        self.weights = self.rng.standard_normal(n, dtype=dtype) * dtype(np.sqrt(1.0 / n))
         self.bias = 0.0
         
         prev_cost = float('inf')
+        log_every = self.log_cost_every
+        cost_history = np.empty(-(-self.max_iterations // log_every), dtype=np.float32)
+        n_logged = 0
+        self.n_iter_ = 0
+        
+        # Work buffers reused by every iteration
+        logits = np.empty(m, dtype=dtype)
+        residual = np.empty(m, dtype=dtype)
+        grad = np.empty(n + 1, dtype=dtype)
+        order = np.arange(m)
+        self._reset_optimizer_state()
+        
+        if self.optimizer == 'lbfgs':
+            self._fit_lbfgs(X, y)
+            return
+        
+        if NUMBA_AVAILABLE and not self.batch_size and self.optimizer == 'gd':
+            self._fit_jit(X, y, np.ones(m, dtype=dtype), cost_history, log_every)
+            return
+        
+        if not self.batch_size:
+            X_aug, XT_aug, theta = self._fold_bias(X)
         
         for i in range(self.max_iterations):
-            # Forward pass
-            z = X.dot(self.weights) + self.bias
-            predictions = self.sigmoid(z)
+            log_cost = i % log_every == 0
             
-            # Compute cost (log-likelihood)
-            cost = self._compute_cost(y, predictions)
-            self.cost_history.append(cost)
+            if self.batch_size:
+                # One epoch of mini-batch SGD; the cost is the epoch average
+                cost = self._sgd_epoch(X, y, order)
+            else:
+                # Forward pass: the bias rides along as the weight of the ones column
+                theta[n] = self.bias
+                np.dot(X_aug, theta, out=logits)
+                
+                # Compute cost (log-likelihood) straight from the logits
+                if log_cost:
+                    cost = self._compute_cost(y, logits)
+                
+                # Weight and bias gradients from the residual sigmoid(z) - y in one product
+                expit(logits, out=residual)
+                residual -= y
+                np.dot(XT_aug, residual, out=grad)
+                grad /= m
+                
+                # Update weights
+                self._apply_gradients(grad[:n], grad[n])
             
-            # Compute gradients
-            dw = (1/m) * X.T.dot(predictions - y)
-            db = (1/m) * np.sum(predictions - y)
+            self.n_iter_ = i + 1
+            if not log_cost:
+                # Cheap convergence proxy until the next logged cost
+                if not self.batch_size and np.abs(grad).max() < self.tolerance * _GRAD_STOP_FACTOR:
+                    if self.verbose:
+                        logger.info("Converged after %d iterations", i + 1)
+                    break
+                continue
             
-            # Update weights
-            self.weights -= self.learning_rate * dw
-            self.bias -= self.learning_rate * db
+            cost_history[n_logged] = cost
+            n_logged += 1
             
-            # Check for convergence
-            if abs(prev_cost - cost) < self.tolerance:
-                print(f"Converged after {i+1} iterations")
+            # Check for convergence (average change per iteration since the last logged cost)
+            if abs(prev_cost - cost) / log_every < self.tolerance:
+                if self.verbose:
+                    logger.info("Converged after %d iterations", i + 1)
                 break
                 
             prev_cost = cost
             
+            if self.verbose and i % 100 == 0:
+                logger.info("Iteration %d, Cost: %.4f", i, cost)
+        
+        self.cost_history = cost_history[:n_logged]
+    
+    def _fold_bias(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Append a ones column to X so the bias folds into the weight vector
+        
+        self.weights becomes a view of the first n entries of the returned
+        parameter vector, so in-place weight updates land in it; callers
+        write the bias into its last entry before each product.
+        
+        Returns:
+            X with the ones column, its contiguous transpose, and the
+            parameter vector [weights, bias]
+        """
+        m, n = X.shape
+        X_aug = np.empty((m, n + 1), dtype=X.dtype)
+        X_aug[:, :n] = X
+        X_aug[:, n] = 1
+        
+        theta = np.empty(n + 1, dtype=self.weights.dtype)
+        theta[:n] = self.weights
+        theta[n] = self.bias
+        self.weights = theta[:n]
+        # Contiguous transpose, so the gradient product streams memory sequentially
+        return X_aug, np.ascontiguousarray(X_aug.T), theta
+    
+    def _fit_jit(self, X: np.ndarray, y: np.ndarray, sample_weights: np.ndarray,
+                 cost_history: np.ndarray, log_every: int, cost_label: str = 'Cost') -> None:
+        """Run plain full-batch gradient descent through the compiled kernel"""
+        bias, n_iter, converged = _gd_kernel(X, y, sample_weights, self.weights, float(self.bias),
+                                             self.learning_rate, self.max_iterations, self.tolerance,
+                                             log_every, cost_history)
+        self.bias = bias
+        self.n_iter_ = n_iter
+        n_logged = (n_iter - 1) // log_every + 1
+        self.cost_history = cost_history[:n_logged]
+        
+        if not self.verbose:
+            return
+        
+        # Same progress output as the NumPy loop, after the fact; a cost that
+        # triggered convergence isn't reported as progress
+        stopped_on_cost = converged and (n_iter - 1) % log_every == 0
+        last_logged = n_logged - 1 if stopped_on_cost else n_logged
+        for k in range(last_logged):
+            i = k * log_every
             if i % 100 == 0:
-                print(f"Iteration {i}, Cost: {cost:.4f}")
+                logger.info("Iteration %d, %s: %.4f", i, cost_label, cost_history[k])
+        if converged:
+            logger.info("Converged after %d iterations", n_iter)
+    
+    def _fit_lbfgs(self, X: np.ndarray, y: np.ndarray, sample_weights: np.ndarray = None) -> None:
+        """
+        Minimize the (sample-weighted) cross-entropy with L-BFGS-B
+        
+        Each objective call returns the loss and its gradient from one pass
+        X @ w and one X.T @ residual, and converges in far fewer iterations
+        than fixed-step gradient descent. Stops when the projected gradient
+        falls below tolerance or after max_iterations iterations.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        m, n = X.shape
+        XT = np.ascontiguousarray(X.T)
+        last_cost = 0.0
+        
+        def objective(theta):
+            nonlocal last_cost
+            z = X.dot(theta[:n]) + theta[n]
+            residual = expit(z) - y
+            if sample_weights is not None:
+                residual *= sample_weights
+            
+            grad = np.empty(n + 1)
+            grad[:n] = XT.dot(residual) / m
+            grad[n] = residual.sum() / m
+            last_cost = _bce_from_logits(z, y, sample_weights)
+            return last_cost, grad
+        
+        # The last objective call of each iteration is at the accepted point
+        cost_history = np.empty(self.max_iterations, dtype=np.float32)
+        n_logged = 0
+        
+        def record_cost(theta):
+            nonlocal n_logged
+            cost_history[n_logged] = last_cost
+            n_logged += 1
+        
+        theta0 = np.append(self.weights, self.bias).astype(np.float64)
+        result = minimize(objective, theta0, jac=True, method='L-BFGS-B', callback=record_cost,
+                          options={'maxiter': self.max_iterations, 'gtol': self.tolerance})
+        
+        self.weights = result.x[:n].astype(self.weights.dtype)
+        self.bias = float(result.x[n])
+        self.n_iter_ = int(result.nit)
+        self.cost_history = cost_history[:n_logged]
+        if self.verbose and result.success:
+            logger.info("Converged after %d iterations", self.n_iter_)
+    
+    def _sgd_epoch(self, X: np.ndarray, y: np.ndarray, order: np.ndarray) -> float:
+        """
+        Run one shuffled pass of mini-batch gradient descent
+        
+        Args:
+            X: Feature matrix (m x n)
+            y: Target vector (m,)
+            order: Row index array, shuffled in place
+            
+        Returns:
+            Average cost over the epoch, measured before each batch update
+        """
+        self.rng.shuffle(order)
+        total_cost = 0.0
+        
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            X_batch = X[batch]
+            y_batch = y[batch]
+            
+            z = X_batch.dot(self.weights) + self.bias
+            total_cost += _bce_from_logits(z, y_batch) * len(batch)
+            
+            residual = expit(z) - y_batch
+            self._apply_gradients(X_batch.T.dot(residual) / len(batch), residual.mean())
+        
+        return total_cost / len(order)
+    
+    def _reset_optimizer_state(self) -> None:
+        """Zero the momentum / moment estimates before a new fit"""
+        self._velocity_w = np.zeros_like(self.weights)
+        self._velocity_b = 0.0
+        self._second_moment_w = np.zeros_like(self.weights)
+        self._second_moment_b = 0.0
+        self._step_count = 0
+    
+    def _apply_gradients(self, dw: np.ndarray, db: float) -> None:
+        """Update the weights and bias from their gradients with the configured optimizer"""
+        lr = self.learning_rate
+        
+        if self.optimizer == 'gd':
+            self.weights -= lr * dw
+            self.bias -= lr * db
+            return
+        
+        beta = self.beta
+        self._velocity_w *= beta
+        self._velocity_w += (1 - beta) * dw
+        self._velocity_b = beta * self._velocity_b + (1 - beta) * db
+        
+        if self.optimizer == 'momentum':
+            self.weights -= lr * self._velocity_w
+            self.bias -= lr * self._velocity_b
+            return
+        
+        # Adam: scale the bias-corrected first moment by the root of the second
+        beta2 = self.ADAM_BETA2
+        self._step_count += 1
+        self._second_moment_w *= beta2
+        self._second_moment_w += (1 - beta2) * dw * dw
+        self._second_moment_b = beta2 * self._second_moment_b + (1 - beta2) * db * db
+        
+        correction1 = 1 - beta ** self._step_count
+        correction2 = 1 - beta2 ** self._step_count
+        self.weights -= lr * (self._velocity_w / correction1) / (
+            np.sqrt(self._second_moment_w / correction2) + self.ADAM_EPSILON)
+        self.bias -= lr * (self._velocity_b / correction1) / (
+            np.sqrt(self._second_moment_b / correction2) + self.ADAM_EPSILON)
     
     def fit_weighted(self, X: np.ndarray, y: np.ndarray, sample_weights: np.ndarray = None) -> None:
         """
         Train the logistic regression model with sample weights for class balancing
         
+        Full-batch only: honors optimizer and log_cost_every like fit, but
+        there is no weighted mini-batch SGD, so batch_size must be None.
+        
         Args:
             X: Feature matrix (m x n)
             y: Target vector (m,)
             sample_weights: Sample weights for class balancing (m,)
         """
-        X = np.asarray(X, dtype=np.float64)
-        y = np.asarray(y, dtype=np.float64)
+        if self.batch_size:
+            raise ValueError("fit_weighted does not support mini-batches; use batch_size=None")
+        
+        # float32 storage as in fit; the cost is still computed in float64
+        dtype = np.float32
+        X = np.ascontiguousarray(X, dtype=dtype)
+        y = np.asarray(y, dtype=dtype)
         m, n = X.shape
         
         if sample_weights is None:
-            sample_weights = np.ones(m)
+            sample_weights = np.ones(m, dtype=dtype)
         else:
             sample_weights = np.asarray(sample_weights, dtype=np.float64)
+            # Normalize sample weights (summed in float64)
+            sample_weights = (sample_weights * (m / np.sum(sample_weights))).astype(dtype)
         
-        # Normalize sample weights
-        sample_weights = sample_weights / np.sum(sample_weights) * m
-        
-        # Initialize weights and bias
-        self.weights = np.random.normal(0, 0.01, n).astype(np.float64)
+        # Initialize weights (Xavier scaling) and bias
+        self.weights = self.rng.standard_normal(n, dtype=dtype) * dtype(np.sqrt(1.0 / n))
         self.bias = 0.0
         
         prev_cost = float('inf')
+        log_every = self.log_cost_every
+        cost_history = np.empty(-(-self.max_iterations // log_every), dtype=np.float32)
+        n_logged = 0
+        self.n_iter_ = 0
+        
+        if self.optimizer == 'lbfgs':
+            self._fit_lbfgs(X, y, sample_weights)
+            return
+        
+        if NUMBA_AVAILABLE and self.optimizer == 'gd':
+            # Same loop fused into one pass over X per iteration
+            self._fit_jit(X, y, sample_weights, cost_history, log_every, 'Weighted Cost')
+            return
+        
+        X_aug, XT_aug, theta = self._fold_bias(X)
+        self._reset_optimizer_state()
+        
+        # Work buffers reused by every iteration
+        logits = np.empty(m, dtype=dtype)
+        residual = np.empty(m, dtype=dtype)
+        grad = np.empty(n + 1, dtype=dtype)
         
         for i in range(self.max_iterations):
-            # Forward pass
-            z = X.dot(self.weights) + self.bias
-            predictions = self.sigmoid(z)
+            log_cost = i % log_every == 0
+            
+            # Forward pass (bias folded in as the ones column's weight)
+            theta[n] = self.bias
+            np.dot(X_aug, theta, out=logits)
             
-            # Compute weighted cost
-            cost = self._compute_weighted_cost(y, predictions, sample_weights)
-            self.cost_history.append(cost)
+            # Compute weighted cost straight from the logits
+            if log_cost:
+                cost = self._compute_weighted_cost(y, logits, sample_weights)
             
-            # Compute weighted gradients
-            error = predictions - y
-            dw = (1/m) * X.T.dot(error * sample_weights)
-            db = (1/m) * np.sum(error * sample_weights)
+            # Weighted residual computed once, in place; the last gradient entry is the bias's
+            expit(logits, out=residual)
+            residual -= y
+            residual *= sample_weights
+            np.dot(XT_aug, residual, out=grad)
+            grad /= m
             
             # Update weights
-            self.weights -= self.learning_rate * dw
-            self.bias -= self.learning_rate * db
+            self._apply_gradients(grad[:n], grad[n])
+            
+            self.n_iter_ = i + 1
+            if not log_cost:
+                # Cheap convergence proxy until the next logged cost
+                if np.abs(grad).max() < self.tolerance * _GRAD_STOP_FACTOR:
+                    if self.verbose:
+                        logger.info("Converged after %d iterations", i + 1)
+                    break
+                continue
             
-            # Check for convergence
-            if abs(prev_cost - cost) < self.tolerance:
-                print(f"Converged after {i+1} iterations")
+            cost_history[n_logged] = cost
+            n_logged += 1
+            
+            # Check for convergence (average change per iteration since the last logged cost)
+            if abs(prev_cost - cost) / log_every < self.tolerance:
+                if self.verbose:
+                    logger.info("Converged after %d iterations", i + 1)
                 break
                 
             prev_cost = cost
             
-            if i % 100 == 0:
-                print(f"Iteration {i}, Weighted Cost: {cost:.4f}")
-    
-    def _compute_weighted_cost(self, y_true: np.ndarray, y_pred: np.ndarray, sample_weights: np.ndarray) -> float:
-        """Compute weighted logistic regression cost"""
-        y_true = np.asarray(y_true, dtype=np.float64)
-        y_pred = np.asarray(y_pred, dtype=np.float64)
-        sample_weights = np.asarray(sample_weights, dtype=np.float64)
-        m = len(y_true)
-        
-        # Add small epsilon to prevent log(0)
-        epsilon = 1e-15
-        y_pred = np.clip(y_pred, epsilon, 1 - epsilon)
-        
-        # Weighted cross-entropy
-        cost = -(1/m) * np.sum(sample_weights * (y_true * np.log(y_pred) + (1 - y_true) * np.log(1 - y_pred)))
-        return cost
-    
-    def _compute_cost(self, y_true: np.ndarray, y_pred: np.ndarray) -> float:
-        """Compute logistic regression cost (cross-entropy)"""
-        y_true = np.asarray(y_true, dtype=np.float64)
-        y_pred = np.asarray(y_pred, dtype=np.float64)
-        m = len(y_true)
-        # Add small epsilon to prevent log(0)
-        epsilon = 1e-15
-        y_pred = np.clip(y_pred, epsilon, 1 - epsilon)
-        return -(1/m) * np.sum(y_true * np.log(y_pred) + (1 - y_true) * np.log(1 - y_pred))
+            if self.verbose and i % 100 == 0:
+                logger.info("Iteration %d, Weighted Cost: %.4f", i, cost)
+        
+        self.cost_history = cost_history[:n_logged]
+    
+    def _compute_weighted_cost(self, y_true: np.ndarray, logits: np.ndarray, sample_weights: np.ndarray) -> float:
+        """Compute weighted logistic regression cost (cross-entropy) from the logits"""
+        return _bce_from_logits(logits, y_true, sample_weights)
+    
+    def _compute_cost(self, y_true: np.ndarray, logits: np.ndarray) -> float:
+        """Compute logistic regression cost (cross-entropy) from the logits"""
+        return _bce_from_logits(logits, y_true)
+    
+    def predict_logits(self, X: np.ndarray) -> np.ndarray:
+        """Predict the raw scores (log-odds) X @ w + b"""
+        X = np.asarray(X, dtype=np.float32)
+        return X.dot(self.weights) + self.bias
     
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """Predict class probabilities"""
-        X = np.asarray(X, dtype=np.float64)
-        z = X.dot(self.weights) + self.bias
-        return self.sigmoid(z)
+        return self.sigmoid(self.predict_logits(X))
     
     def predict(self, X: np.ndarray) -> np.ndarray:
         """Make binary predictions"""
@@ -211,7 +692,8 @@ class ModelEvaluator:
     
     @staticmethod
     def evaluate_binary_classification(y_true: np.ndarray, y_pred: np.ndarray, 
-                                     y_pred_proba: np.ndarray = None) -> Dict[str, float]:
+                                     y_pred_proba: np.ndarray = None,
+                                     logits: np.ndarray = None) -> Dict[str, float]:
         """
         Evaluate binary classification performance
         
@@ -219,18 +701,17 @@ class ModelEvaluator:
             y_true: True labels
             y_pred: Predicted labels
             y_pred_proba: Predicted probabilities (optional)
+            logits: Predicted log-odds (optional); preferred over y_pred_proba for the log loss
             
         Returns:
             Dictionary with evaluation metrics
         """
-        # Accuracy
-        accuracy = np.mean(y_pred == y_true)
+        # Confusion Matrix in one pass: cell index = 2 * true label + predicted label
+        key = (np.asarray(y_true).astype(np.intp) << 1) | np.asarray(y_pred).astype(np.intp)
+        tn, fp, fn, tp = np.bincount(key, minlength=4)[:4]
         
-        # Confusion Matrix
-        tp = np.sum((y_pred == 1) & (y_true == 1))
-        tn = np.sum((y_pred == 0) & (y_true == 0))
-        fp = np.sum((y_pred == 1) & (y_true == 0))
-        fn = np.sum((y_pred == 0) & (y_true == 1))
+        # Accuracy
+        accuracy = (tp + tn) / len(key)
         
         # Precision, Recall, F1
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0
@@ -245,12 +726,20 @@ class ModelEvaluator:
             'confusion_matrix': [[tn, fp], [fn, tp]]
         }
         
-        # Log Loss (if probabilities provided)
-        if y_pred_proba is not None:
+        # Log Loss (if scores provided); from the logits it needs no sigmoid or clipping
+        if logits is not None:
+            metrics['log_loss'] = _bce_from_logits(np.asarray(logits, dtype=np.float64), y_true)
+        elif y_pred_proba is not None:
             epsilon = 1e-15
-            y_pred_proba = np.clip(y_pred_proba, epsilon, 1 - epsilon)
-            log_loss = -np.mean(y_true * np.log(y_pred_proba) + (1 - y_true) * np.log(1 - y_pred_proba))
-            metrics['log_loss'] = log_loss
+            # float64, since 1 - 1e-15 rounds to 1.0 in float32
+            y_pred_proba = np.clip(np.asarray(y_pred_proba, dtype=np.float64), epsilon, 1 - epsilon)
+            # y*log(p) + (1-y)*log(1-p) = log1p(-p) + y*(log(p) - log1p(-p)), built in place
+            log_not_p = np.log1p(-y_pred_proba)
+            log_likelihood = np.log(y_pred_proba, out=y_pred_proba)
+            log_likelihood -= log_not_p
+            log_likelihood *= y_true
+            log_likelihood += log_not_p
+            metrics['log_loss'] = -log_likelihood.mean()
         
         return metrics
     
@@ -281,7 +770,8 @@ class DataUtils:
     
     @staticmethod
     def normalize_features(X: np.ndarray, feature_means: np.ndarray = None, 
-                          feature_stds: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                          feature_stds: np.ndarray = None,
+                          out: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Normalize features using z-score normalization
         
@@ -289,20 +779,60 @@ class DataUtils:
             X: Feature matrix
             feature_means: Pre-computed means (optional)
             feature_stds: Pre-computed standard deviations (optional)
+            out: float32 array to write the normalized features to (optional;
+                may be X itself when X is float32 and can be overwritten)
             
         Returns:
             Normalized features, means, and standard deviations
         """
-        X = np.asarray(X, dtype=np.float64)
+        # float32 like the model's storage; the statistics stay float64
+        X_in = X
+        X = np.asarray(X, dtype=np.float32)
         
         if feature_means is None or feature_stds is None:
-            feature_means = np.mean(X, axis=0, dtype=np.float64)
-            feature_stds = np.std(X, axis=0, dtype=np.float64)
-            # Prevent division by zero
-            feature_stds = np.where(feature_stds == 0, 1, feature_stds)
+            feature_means, feature_stds = DataUtils.compute_stats(X)
+        
+        if out is None:
+            # Converting an ndarray to float32 already made a private copy; normalize that in place
+            out = X if isinstance(X_in, np.ndarray) and X is not X_in else np.empty_like(X)
+        np.subtract(X, feature_means.astype(np.float32), out=out)
+        np.divide(out, feature_stds.astype(np.float32), out=out)
+        return out, feature_means, feature_stds
+    
+    @staticmethod
+    def compute_stats(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the z-score normalization statistics of a feature matrix
         
-        X_normalized = (X - feature_means) / feature_stds
-        return X_normalized, feature_means, feature_stds
+        Args:
+            X: Feature matrix
+            
+        Returns:
+            Feature means and standard deviations
+        """
+        feature_means = np.mean(X, axis=0, dtype=np.float64)
+        feature_stds = np.std(X, axis=0, dtype=np.float64)
+        # Prevent division by zero
+        feature_stds = np.where(feature_stds == 0, 1, feature_stds)
+        return feature_means, feature_stds
+    
+    @staticmethod
+    def normalize_inplace(X: np.ndarray, feature_means: np.ndarray,
+                          feature_stds: np.ndarray) -> np.ndarray:
+        """
+        Apply z-score normalization to a floating point matrix in place
+        
+        Args:
+            X: Feature matrix, overwritten with the normalized values
+            feature_means: Pre-computed means
+            feature_stds: Pre-computed standard deviations
+            
+        Returns:
+            The same array, normalized
+        """
+        np.subtract(X, feature_means, out=X)
+        np.divide(X, feature_stds, out=X)
+        return X
     
     @staticmethod
     def split_data(X: np.ndarray, y: np.ndarray, 
@@ -317,7 +847,8 @@ class DataUtils:
             val_ratio: Validation set ratio
             
         Returns:
-            Tuple of (X_train, X_val, X_test, y_train, y_val, y_test)
+            Tuple of (X_train, X_val, X_test, y_train, y_val, y_test); views
+            into one shuffled copy, so they never alias X or y
         """
         m = len(X)
         indices = np.random.permutation(m)
@@ -325,13 +856,30 @@ class DataUtils:
         train_end = int(train_ratio * m)
         val_end = int((train_ratio + val_ratio) * m)
         
-        train_idx = indices[:train_end]
-        val_idx = indices[train_end:val_end]
-        test_idx = indices[val_end:]
+        # One row gather into shuffled order, then contiguous slices of it
+        X_shuffled = X[indices]
+        y_shuffled = y[indices]
         
-        X_train, X_val, X_test = X[train_idx], X[val_idx], X[test_idx]
-        y_train, y_val, y_test = y[train_idx], y[val_idx], y[test_idx]
+        X_train, X_val, X_test = X_shuffled[:train_end], X_shuffled[train_end:val_end], X_shuffled[val_end:]
+        y_train, y_val, y_test = y_shuffled[:train_end], y_shuffled[train_end:val_end], y_shuffled[val_end:]
         
         print(f"Data split - Train: {len(X_train)}, Val: {len(X_val)}, Test: {len(X_test)}")
         
-        return X_train, X_val, X_test, y_train, y_val, y_test 
\ No newline at end of file
+        return X_train, X_val, X_test, y_train, y_val, y_test 
+
+
+def _fit_fold(params: Dict[str, Any], X: np.ndarray, y: np.ndarray,
+              train_idx: np.ndarray, test_idx: np.ndarray) -> Dict[str, float]:
+    """Train a fresh model on one cross-validation fold and evaluate it on the held-out rows"""
+    # Fancy indexing copies, so both parts can be normalized in place
+    X_train, X_test = X[train_idx], X[test_idx]
+    feature_means, feature_stds = DataUtils.compute_stats(X_train)
+    DataUtils.normalize_inplace(X_train, feature_means, feature_stds)
+    DataUtils.normalize_inplace(X_test, feature_means, feature_stds)
+    
+    model = LogisticRegression(**params)
+    model.fit(X_train, y[train_idx])
+    
+    logits = model.predict_logits(X_test)
+    return ModelEvaluator.evaluate_binary_classification(
+        y[test_idx], (logits >= 0).astype(np.int8), logits=logits)
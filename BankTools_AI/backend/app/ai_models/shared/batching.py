@@ -0,0 +1,112 @@
+"""
+Micro-batching for single-record model predictions
+
+Concurrent requests that each predict one record are queued and handed to
+a background worker, which scores everything that arrives within a short
+window with one vectorized predict_batch call.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+
+class BatchingPredictor:
+    """
+    Funnel concurrent single predictions into batched predict calls
+
+    The worker takes the first queued record, keeps collecting records for
+    up to max_wait seconds (or until max_batch_size), then scores them with
+    one predict_batch call and resolves each caller's future. If that call
+    raises, the records are scored one by one, so only the bad ones fail.
+    Records that queue up while a batch is being scored go into the next
+    batch even with max_wait=0.
+    """
+
+    # Seconds a caller waits for its result before giving up
+    DEFAULT_TIMEOUT = 30.0
+
+    def __init__(self, predict_batch: Callable[[List[Any]], List[Any]],
+                 max_wait: float = 0.01, max_batch_size: int = 64):
+        """
+        Args:
+            predict_batch: Scores a list of records, returning one result per record in order
+            max_wait: Seconds to keep collecting records after the first one arrives
+            max_batch_size: Most records scored by one predict_batch call
+        """
+        self._predict_batch = predict_batch
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def predict(self, record: Any, timeout: float = DEFAULT_TIMEOUT) -> Any:
+        """
+        Score one record as part of the next batch
+        
+        Raises what predict_batch raised, or concurrent.futures.TimeoutError
+        when no result arrives within timeout seconds (None waits forever).
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((record, future))
+        return future.result(timeout)
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread in this process (threads don't survive a fork)"""
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                threading.Thread(target=self._run, name='batching-predictor', daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def _collect_batch(self) -> list:
+        """Block for the first queued request, then gather more until the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Past the deadline, only take what is already queued
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: score each collected batch and resolve its futures"""
+        while True:
+            batch = self._collect_batch()
+            try:
+                results = self._predict_batch([record for record, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"predict_batch returned {len(results)} results for {len(batch)} records")
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception:
+                # One bad record must not fail the others: score each on its own
+                self._predict_each(batch)
+            finally:
+                # Never leave a caller waiting, whatever escaped above
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Batch prediction did not produce a result"))
+
+    def _predict_each(self, batch: list) -> None:
+        """Resolve each still-pending future with its own single-record predict_batch call"""
+        for record, future in batch:
+            if future.done():
+                continue
+            try:
+                results = self._predict_batch([record])
+                if len(results) != 1:
+                    raise RuntimeError(f"predict_batch returned {len(results)} results for 1 record")
+                future.set_result(results[0])
+            except Exception as e:
+                future.set_exception(e)
@@ -5,7 +5,6 @@ Data cleaning utilities for AI models
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, Tuple
-from scipy import stats
 
 
 class DataCleaner:
@@ -13,17 +12,23 @@ class DataCleaner:
     Enhanced data cleaning utilities
     """
     
+    # Float quantization modes accepted by comprehensive_clean / _optimize_data_types
+    QUANTIZE_MODES = (None, 'fp16')
+    
     def __init__(self):
         self.cleaning_log = []
     
     def comprehensive_clean(self, df: pd.DataFrame, 
-                          target_col: Optional[str] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+                          target_col: Optional[str] = None,
+                          quantize: Optional[str] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Comprehensive data cleaning pipeline
         
         Args:
             df: Input DataFrame
             target_col: Target column name (if any)
+            quantize: 'fp16' to store float columns as float16 where their
+                values fit (for frames only used for statistics/features)
             
         Returns:
             Cleaned DataFrame and cleaning report
@@ -36,19 +41,21 @@ class DataCleaner:
             'values_imputed': 0
         }
         
-        df_clean = df.copy()
+        # Step 1: Remove completely empty rows and columns, both from one null scan
+        # (the empty rows are null in every column, so dropping them first
+        # doesn't change which columns are empty)
+        is_null = df.isna().to_numpy()
+        keep_rows = ~is_null.all(axis=1)
+        keep_cols = ~is_null.all(axis=0)
+        # Boolean .loc selection returns a copy, so df itself is never modified
+        df_clean = df.loc[keep_rows, keep_cols]
         
-        # Step 1: Remove completely empty rows and columns
-        initial_rows = len(df_clean)
-        df_clean = df_clean.dropna(how='all')
-        rows_removed = initial_rows - len(df_clean)
+        rows_removed = int(len(keep_rows) - keep_rows.sum())
         cleaning_report['rows_removed'] += rows_removed
         if rows_removed > 0:
             cleaning_report['steps_performed'].append(f"Removed {rows_removed} completely empty rows")
         
-        initial_cols = len(df_clean.columns)
-        df_clean = df_clean.dropna(axis=1, how='all')
-        cols_removed = initial_cols - len(df_clean.columns)
+        cols_removed = int(len(keep_cols) - keep_cols.sum())
         cleaning_report['columns_removed'] += cols_removed
         if cols_removed > 0:
             cleaning_report['steps_performed'].append(f"Removed {cols_removed} completely empty columns")
@@ -60,25 +67,30 @@ class DataCleaner:
             'nil', 'void', 'empty', '-', '--', '?', '??', 'NaN', 'NULL', 'NONE'
         ]
         
-        for col in df_clean.columns:
-            if df_clean[col].dtype == 'object':
-                # Replace string representations of missing values
-                mask = df_clean[col].astype(str).str.strip().str.lower().isin(missing_patterns)
-                values_replaced = mask.sum()
-                if values_replaced > 0:
-                    df_clean.loc[mask, col] = np.nan
+        # Replace string representations of missing values, all object columns at once
+        object_cols = df_clean.columns[(df_clean.dtypes == 'object').to_numpy()]
+        if len(object_cols) > 0:
+            token_mask = self._missing_token_mask(df_clean[object_cols].to_numpy(), missing_patterns)
+            replaced_counts = token_mask.sum(axis=0)
+            has_tokens = replaced_counts > 0
+            if has_tokens.any():
+                token_cols = object_cols[has_tokens]
+                df_clean[token_cols] = df_clean[token_cols].mask(token_mask[:, has_tokens])
+                for col, values_replaced in zip(token_cols, replaced_counts[has_tokens]):
                     cleaning_report['values_imputed'] += values_replaced
                     cleaning_report['steps_performed'].append(
                         f"Replaced {values_replaced} string null values in {col}"
                     )
         
-        # Step 3: Handle infinite values
-        numeric_cols = df_clean.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            inf_mask = np.isinf(df_clean[col])
-            inf_count = inf_mask.sum()
-            if inf_count > 0:
-                df_clean.loc[inf_mask, col] = np.nan
+        # Step 3: Handle infinite values (one isinf pass over the numeric block)
+        numeric = df_clean.select_dtypes(include=[np.number])
+        inf_mask = np.isinf(numeric.to_numpy(dtype=np.float64, na_value=np.nan))
+        inf_counts = inf_mask.sum(axis=0)
+        has_inf = inf_counts > 0
+        if has_inf.any():
+            inf_cols = numeric.columns[has_inf]
+            df_clean[inf_cols] = numeric[inf_cols].mask(inf_mask[:, has_inf])
+            for col, inf_count in zip(inf_cols, inf_counts[has_inf]):
                 cleaning_report['values_imputed'] += inf_count
                 cleaning_report['steps_performed'].append(
                     f"Replaced {inf_count} infinite values in {col} with NaN"
@@ -90,7 +102,7 @@ class DataCleaner:
         cleaning_report['steps_performed'].extend(imputation_report['steps'])
         
         # Step 5: Data type optimization
-        df_clean = self._optimize_data_types(df_clean)
+        df_clean = self._optimize_data_types(df_clean, quantize)
         cleaning_report['steps_performed'].append("Optimized data types")
         
         cleaning_report['final_shape'] = df_clean.shape
@@ -98,6 +110,29 @@ class DataCleaner:
         
         return df_clean, cleaning_report
     
+    @staticmethod
+    def _missing_token_mask(values: np.ndarray, missing_patterns: list) -> np.ndarray:
+        """
+        Which cells of an object array spell a missing value
+        
+        Same test as astype(str).str.strip().str.lower().isin(missing_patterns),
+        but the values are factorized once so the string normalization runs
+        once per distinct value instead of once per cell. Null cells are
+        tested one by one, since factorize merges None, NaN and pd.NA, which
+        stringify differently.
+        """
+        def is_token(cells: np.ndarray) -> np.ndarray:
+            return pd.Series(cells, dtype=object).astype(str).str.strip().str.lower().isin(missing_patterns).to_numpy()
+        
+        cells = values.ravel()
+        codes, uniques = pd.factorize(cells)
+        # Code -1 (null) picks the trailing False; those cells are filled in below
+        mask = np.append(is_token(uniques), False)[codes]
+        null_cells = np.flatnonzero(codes == -1)
+        if len(null_cells) > 0:
+            mask[null_cells] = is_token(cells[null_cells])
+        return mask.reshape(values.shape)
+    
     def _intelligent_imputation(self, df: pd.DataFrame, 
                                target_col: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -105,27 +140,20 @@ class DataCleaner:
         """
         imputation_report = {'total_imputed': 0, 'steps': []}
         
-        for col in df.columns:
-            if col == target_col:
-                continue
-            
-            missing_count = df[col].isnull().sum()
-            if missing_count == 0:
-                continue
+        missing_counts = df.isnull().sum()
+        columns = [col for col in df.columns if col != target_col and missing_counts[col] > 0]
+        numeric_cols = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+        numeric_fills = self._numeric_fill_values(df[numeric_cols]) if numeric_cols else {}
+        fill_values = {}
+        
+        for col in columns:
+            missing_count = missing_counts[col]
             
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if col in numeric_cols:
                 # For numeric columns, use median for skewed data, mean for normal
-                col_data = df[col].dropna()
-                if len(col_data) > 0:
-                    skewness = abs(stats.skew(col_data))
-                    if skewness > 1:  # Highly skewed
-                        fill_value = col_data.median()
-                        method = "median"
-                    else:
-                        fill_value = col_data.mean()
-                        method = "mean"
-                    
-                    df[col] = df[col].fillna(fill_value)
+                if col in numeric_fills:
+                    fill_value, method = numeric_fills[col]
+                    fill_values[col] = fill_value
                     imputation_report['total_imputed'] += missing_count
                     imputation_report['steps'].append(
                         f"Imputed {missing_count} values in {col} using {method} ({fill_value:.2f})"
@@ -134,18 +162,62 @@ class DataCleaner:
             else:  # Categorical columns
                 mode_value = df[col].mode()
                 if len(mode_value) > 0:
-                    df[col] = df[col].fillna(mode_value[0])
+                    fill_values[col] = mode_value[0]
                     imputation_report['total_imputed'] += missing_count
                     imputation_report['steps'].append(
                         f"Imputed {missing_count} values in {col} using mode ({mode_value[0]})"
                     )
         
+        # One fillna over every imputed column, written back into df
+        if fill_values:
+            filled_cols = list(fill_values)
+            df[filled_cols] = df[filled_cols].fillna(fill_values)
+        
         return imputation_report
     
-    def _optimize_data_types(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _numeric_fill_values(numeric: pd.DataFrame) -> Dict[str, Tuple[float, str]]:
+        """
+        Fill value and method of each numeric column: the median when the
+        column is highly skewed (|skewness| > 1), the mean otherwise
+        
+        Counts, means and the biased skewness (as scipy.stats.skew) of all
+        columns come from whole-block NumPy reductions over the observed
+        values. Columns with no observed values get no entry.
+        """
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        observed = ~np.isnan(values)
+        counts = observed.sum(axis=0)
+        has_data = counts > 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(observed, values, 0.0).sum(axis=0) / counts
+            deviations = np.where(observed, values - means, 0.0)
+            m2 = np.square(deviations).sum(axis=0) / counts
+            m3 = np.power(deviations, 3).sum(axis=0) / counts
+            # Constant columns give 0/0 = NaN, which is not > 1, so they use the mean
+            skewed = np.abs(m3 / m2 ** 1.5) > 1
+        
+        medians = np.full(len(counts), np.nan)
+        if has_data.any():
+            medians[has_data] = np.nanmedian(values[:, has_data], axis=0)
+        
+        return {
+            col: (medians[i], "median") if skewed[i] else (means[i], "mean")
+            for i, col in enumerate(numeric.columns) if has_data[i]
+        }
+    
+    def _optimize_data_types(self, df: pd.DataFrame, quantize: Optional[str] = None) -> pd.DataFrame:
         """
         Optimize data types for memory efficiency
+        
+        Float columns are downcast to float32 when that is lossless; with
+        quantize='fp16' they are further stored as float16 when every
+        nonzero magnitude lies in float16's normal range.
         """
+        if quantize not in self.QUANTIZE_MODES:
+            raise ValueError(f"Unknown quantize mode '{quantize}', expected one of {self.QUANTIZE_MODES}")
+        
         df_optimized = df.copy()
         
         for col in df_optimized.columns:
@@ -172,9 +244,22 @@ class DataCleaner:
             elif pd.api.types.is_float_dtype(df_optimized[col]):
                 # Optimize float types
                 df_optimized[col] = pd.to_numeric(df_optimized[col], downcast='float')
+                if quantize == 'fp16' and self._fits_float16(df_optimized[col]):
+                    df_optimized[col] = df_optimized[col].astype(np.float16)
         
         return df_optimized
     
+    @staticmethod
+    def _fits_float16(values: pd.Series) -> bool:
+        """Whether every nonzero magnitude is within float16's normal range (no overflow or underflow)"""
+        magnitudes = np.abs(values.to_numpy(dtype=np.float64, na_value=np.nan))
+        # NaN > 0 is False, so missing values are skipped along with zeros
+        magnitudes = magnitudes[magnitudes > 0]
+        if len(magnitudes) == 0:
+            return True
+        float16 = np.finfo(np.float16)
+        return magnitudes.max() <= float16.max and magnitudes.min() >= float16.smallest_normal
+    
     def _calculate_quality_score(self, df: pd.DataFrame) -> float:
         """
         Calculate overall data quality score (0-100)
@@ -206,26 +291,30 @@ class LoanDataCleaner:
         """
         Clean loan-specific data
         """
-        df_clean = df.copy()
+        # One null scan decides which columns need a fill value
+        has_nulls = df.isnull().any()
+        fill_values = {}
         
         # Handle missing values for categorical variables
         categorical_cols = ['Gender', 'Married', 'Dependents', 'Education', 'Self_Employed', 'Property_Area']
         for col in categorical_cols:
-            if col in df_clean.columns and df_clean[col].isnull().any():
-                mode_value = df_clean[col].mode()
+            if col in df.columns and has_nulls[col]:
+                mode_value = df[col].mode()
                 if len(mode_value) > 0:
-                    df_clean[col] = df_clean[col].fillna(mode_value[0])
+                    fill_values[col] = mode_value[0]
         
         # Handle missing values for numerical variables
         numerical_cols = ['ApplicantIncome', 'CoapplicantIncome', 'LoanAmount', 'Loan_Amount_Term', 'Credit_History']
         for col in numerical_cols:
-            if col in df_clean.columns and df_clean[col].isnull().any():
-                df_clean[col] = df_clean[col].fillna(df_clean[col].median())
+            if col in df.columns and has_nulls[col]:
+                fill_values[col] = df[col].median()
+        
+        # A single fillna call; it also returns the copy that the rest of the cleaning works on
+        df_clean = df.fillna(fill_values)
         
         # Handle Dependents column (convert '3+' to '3')
         if 'Dependents' in df_clean.columns:
-            df_clean['Dependents'] = df_clean['Dependents'].replace('3+', '3')
-            df_clean['Dependents'] = pd.to_numeric(df_clean['Dependents'], errors='coerce')
-            df_clean['Dependents'] = df_clean['Dependents'].fillna(0)
+            df_clean['Dependents'] = pd.to_numeric(df_clean['Dependents'].replace('3+', '3'),
+                                                   errors='coerce').fillna(0)
         
         return df_clean 
\ No newline at end of file
@@ -313,26 +313,28 @@ class EnhancedDataCleaner:
     def _remove_outliers(self, df: pd.DataFrame, cleaning_report: Dict[str, Any], 
                         target_column: str = None) -> pd.DataFrame:
         """Remove outliers using IQR method"""
-        df_clean = df.copy()
-        initial_rows = len(df_clean)
+        initial_rows = len(df)
         
-        numeric_cols = df_clean.select_dtypes(include=[np.number]).columns
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
         if target_column and target_column in numeric_cols:
             numeric_cols = numeric_cols.drop(target_column)  # Don't remove outliers from target
         
-        outlier_mask = pd.Series([False] * len(df_clean))
+        # All-NaN columns can't flag a row (and would make nanquantile warn)
+        data = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        data = data[:, ~np.isnan(data).all(axis=0)]
         
-        for col in numeric_cols:
-            Q1 = df_clean[col].quantile(0.25)
-            Q3 = df_clean[col].quantile(0.75)
+        outlier_mask = np.zeros(len(df), dtype=bool)
+        if data.shape[1] > 0:
+            # Quartiles of every column at once, then one 2-D comparison; NaNs are
+            # ignored by the quartiles and never count as outliers
+            Q1, Q3 = np.nanquantile(data, [0.25, 0.75], axis=0)
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
-            
-            col_outliers = (df_clean[col] < lower_bound) | (df_clean[col] > upper_bound)
-            outlier_mask |= col_outliers
+            outlier_mask = ((data < lower_bound) | (data > upper_bound)).any(axis=1)
         
-        df_clean = df_clean[~outlier_mask]
+        # Positional mask, so it also lines up with a non-default index
+        df_clean = df[~outlier_mask]
         rows_removed = initial_rows - len(df_clean)
         
         if rows_removed > 0:
@@ -2,11 +2,18 @@
 Feature engineering utilities for AI models
 """
 
+import random
+
 import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
 
+def _credit_score_jitter(seed: int) -> int:
+    """Deterministic credit-score offset for a seed, from a private RNG (the global one is never reseeded)"""
+    return random.Random(seed).randint(-50, 50)
+
+
 class ChurnFeatureEngineer:
     """
     Feature engineering for churn prediction model
@@ -202,8 +209,6 @@ class LoanFeatureEngineer:
             base_score -= 30  # Self-employed typically have lower scores
         
         # Add some randomness to make it realistic
-        import random
-        random.seed(int(income) if income > 0 else 42)  # Deterministic randomness
-        base_score += random.randint(-50, 50)
+        base_score += _credit_score_jitter(int(income) if income > 0 else 42)  # Deterministic randomness
         
         return max(300, min(850, base_score))  # Keep within valid range 
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Optional Numba JIT support for AI models
+
+Numba is used when it is installed. Without it, njit returns the decorated
+function unchanged, prange falls back to range, and callers can check
+NUMBA_AVAILABLE to pick a NumPy path.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
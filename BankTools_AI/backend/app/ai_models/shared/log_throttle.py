@@ -0,0 +1,49 @@
+"""
+Rate limiting for repeated exception logs
+
+When a bad deploy makes every request fail the same way, logging each
+traceback burns CPU and I/O on identical lines. should_log_exception()
+lets the first occurrence of an error through and suppresses the same
+error (same exception type raised from the same frames) for the rest of
+the window.
+"""
+
+import sys
+import time
+from functools import lru_cache
+from itertools import count
+
+# Identical errors are logged at most once per window
+LOG_WINDOW_SECONDS = 60
+
+
+@lru_cache(maxsize=64)
+def _occurrences(exc_type: type, tb_hash: int, window: int) -> count:
+    """Occurrence counter for one error signature in one time window"""
+    return count()
+
+
+def _traceback_hash(tb) -> int:
+    """Hash of the (code object, line) pairs along a traceback; no frame formatting"""
+    frames = []
+    while tb is not None:
+        frames.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return hash(tuple(frames))
+
+
+def should_log_exception(exc: BaseException = None) -> bool:
+    """
+    Whether exc (default: the exception being handled) should be logged
+
+    True for the first occurrence of an error signature in the current
+    window, False for repeats. Signatures that fall out of the 64-entry
+    cache are simply logged again.
+    """
+    if exc is None:
+        exc = sys.exc_info()[1]
+        if exc is None:
+            return True
+    window = int(time.monotonic() // LOG_WINDOW_SECONDS)
+    counter = _occurrences(type(exc), _traceback_hash(exc.__traceback__), window)
+    return next(counter) == 0
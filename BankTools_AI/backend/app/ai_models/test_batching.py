@@ -0,0 +1,41 @@
+"""
+Tests for micro-batched predictions
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.ai_models.shared.batching import BatchingPredictor
+
+
+def _double_all(records):
+    """predict_batch that, like the predictors, fails the whole call on one bad record"""
+    if any(not isinstance(record, int) for record in records):
+        raise ValueError("record must be an int")
+    return [record * 2 for record in records]
+
+
+def test_bad_record_fails_only_its_own_request():
+    calls = []
+    
+    def predict_batch(records):
+        calls.append(list(records))
+        return _double_all(records)
+    
+    # A long window so every record lands in the same batch
+    batcher = BatchingPredictor(predict_batch, max_wait=0.5)
+    records = [1, 2, 'forty', 3]
+    with ThreadPoolExecutor(len(records)) as pool:
+        futures = [pool.submit(batcher.predict, record, 5) for record in records]
+    
+    assert sorted(map(len, calls))[-1] == len(records)  # first tried as one batch
+    assert [futures[i].result() for i in (0, 1, 3)] == [2, 4, 6]
+    with pytest.raises(ValueError):
+        futures[2].result()
+
+
+def test_short_result_list_fails_instead_of_hanging():
+    batcher = BatchingPredictor(lambda records: [], max_wait=0)
+    with pytest.raises(RuntimeError):
+        batcher.predict(1, timeout=5)
@@ -0,0 +1,46 @@
+"""
+Tests for the rule-based loan scoring
+"""
+
+import itertools
+
+import pandas as pd
+
+from app.ai_models.loan.loan_utils import (
+    _PURPOSE_SCORES, _rule_score, _rule_score_kernel, rule_based_prediction_batch
+)
+
+NAN = float('nan')
+_VALUES = {
+    'credit_score': [NAN, 300, 650, 720, 800],
+    'income': [NAN, 0, 20000, 60000, 150000],
+    'employment_years': [NAN, 0, 2, 7, 12],
+    'amount': [NAN, 0, 50000, 250000, 900000],
+    'purpose': ['Home Purchase', 'Personal/Other', 'Unknown']
+}
+
+
+def test_scalar_and_batch_scores_agree_with_nan_values():
+    rows = [dict(zip(_VALUES, combo)) for combo in itertools.product(*_VALUES.values())]
+    batch_scores = rule_based_prediction_batch(rows)['score']
+
+    for row, batch_score in zip(rows, batch_scores):
+        numeric = (row['credit_score'], row['income'], row['employment_years'], row['amount'])
+        score, _ = _rule_score(*numeric)
+        assert int(_rule_score_kernel(*numeric)[0]) == score, row
+        assert score + _PURPOSE_SCORES.get(row['purpose'], 0) == batch_score, row
+
+
+def test_nan_debt_to_income_is_in_the_worst_band():
+    # 700 credit (28) + 60k income (18) + 5 years (17) + NaN ratio (-5)
+    score, debt_to_income = _rule_score(700, 60000, 5, NAN)
+    assert debt_to_income != debt_to_income
+    assert score == 58
+
+
+def test_absent_batch_columns_get_the_defaults():
+    result = rule_based_prediction_batch(pd.DataFrame({'income': [NAN, 60000]}))
+    # NaN income is scored as given: bottom income band and a 1.0 ratio
+    expected = [_rule_score(650, income, 2, 100000)[0] + _PURPOSE_SCORES['Personal/Other']
+                for income in (NAN, 60000)]
+    assert list(result['score']) == expected
@@ -0,0 +1,103 @@
+"""
+Tests for saving, loading and scoring the trained predictors
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.ai_models.churn.churn_model_clean import ChurnPredictor
+from app.ai_models.loan.loan_model_clean import LoanPredictor
+from app.ai_models.paths import model_path
+
+# Legacy joblib pickle of the full predictor state, from before the npz format
+LEGACY_CHURN_MODEL = os.path.join(os.path.dirname(__file__), 'churn', 'churn_model.joblib')
+
+CUSTOMERS = [
+    {'CreditScore': 400, 'Geography': 'Germany', 'Gender': 'Female', 'Age': 45, 'Tenure': 1,
+     'Balance': 0, 'NumOfProducts': 1, 'HasCrCard': 0, 'IsActiveMember': 0, 'EstimatedSalary': 30000},
+    {'CreditScore': 780, 'Geography': 'France', 'Gender': 'Male', 'Age': 31, 'Tenure': 8,
+     'Balance': 120000, 'NumOfProducts': 2, 'HasCrCard': 1, 'IsActiveMember': 1, 'EstimatedSalary': 95000},
+    {'CreditScore': 610, 'Geography': 'Spain', 'Gender': 'Female', 'Age': 58, 'Tenure': 4,
+     'Balance': 64000, 'NumOfProducts': 3, 'HasCrCard': 1, 'IsActiveMember': 0, 'EstimatedSalary': 52000}
+]
+
+APPLICATIONS = [
+    {'amount': 150000, 'purpose': 'Home Purchase', 'income': 60000, 'employment_years': 5, 'credit_score': 720},
+    {'amount': 40000, 'purpose': 'Auto Loan', 'income': 25000, 'employment_years': 1, 'credit_score': 580},
+    {'amount': 500000, 'purpose': 'Business Loan', 'income': 140000, 'employment_years': 12, 'credit_score': 810}
+]
+
+
+def _loaded(predictor_class, filepath):
+    predictor = predictor_class()
+    predictor.load_model(filepath)
+    return predictor
+
+
+@pytest.mark.parametrize('predictor_class, filename, records, key', [
+    (ChurnPredictor, 'churn_model.joblib', CUSTOMERS, 'churn_probability'),
+    (LoanPredictor, 'loan_model.joblib', APPLICATIONS, 'approval_probability')
+])
+def test_save_load_round_trip(tmp_path, predictor_class, filename, records, key):
+    original = _loaded(predictor_class, model_path(filename))
+    filepath = str(tmp_path / filename)
+    original.save_model(filepath)
+    restored = _loaded(predictor_class, filepath)
+
+    assert restored.is_trained
+    assert restored.feature_names == original.feature_names
+    np.testing.assert_allclose(restored._w_fused, original._w_fused)
+    np.testing.assert_allclose(restored._b_fused, original._b_fused)
+    for record in records:
+        assert restored.predict(record)[key] == pytest.approx(original.predict(record)[key])
+
+
+def test_save_untrained_model_fails(tmp_path):
+    with pytest.raises(ValueError):
+        LoanPredictor().save_model(str(tmp_path / 'loan_model.joblib'))
+
+
+def test_load_legacy_joblib_model(tmp_path):
+    legacy = _loaded(ChurnPredictor, LEGACY_CHURN_MODEL)
+
+    assert legacy.is_trained
+    probability = legacy.predict(CUSTOMERS[0])['churn_probability']
+    assert 0.0 <= probability <= 1.0
+
+    # Saving converts it to the npz format without changing its predictions
+    filepath = str(tmp_path / 'churn_model.joblib')
+    legacy.save_model(filepath)
+    assert _loaded(ChurnPredictor, filepath).predict(CUSTOMERS[0])['churn_probability'] == pytest.approx(probability)
+
+
+@pytest.mark.parametrize('predictor_class, filename, records, key', [
+    (ChurnPredictor, 'churn_model.joblib', CUSTOMERS, 'churn_probability'),
+    (LoanPredictor, 'loan_model.joblib', APPLICATIONS, 'approval_probability')
+])
+def test_predict_batch_matches_predict(predictor_class, filename, records, key):
+    predictor = _loaded(predictor_class, model_path(filename))
+
+    batch = predictor.predict_batch(records)
+
+    assert len(batch) == len(records)
+    for record, result in zip(records, batch):
+        single = predictor.predict(record)
+        assert result[key] == pytest.approx(single[key])
+        assert result['recommendations'] == single['recommendations']
+
+
+def test_loan_predict_features_matches_normalized_model():
+    predictor = _loaded(LoanPredictor, model_path('loan_model.joblib'))
+    rng = np.random.default_rng(0)
+    features = predictor.feature_means + rng.standard_normal((5, len(predictor.feature_names))) * predictor.feature_stds
+
+    # The fused weights fold the normalization into the weights and bias
+    normalized = (features - predictor.feature_means) / predictor.feature_stds
+    expected = predictor.model.predict_proba(normalized)
+
+    np.testing.assert_allclose(predictor.predict_features(features), expected, rtol=1e-6)
+    assert predictor.predict_features(features[0]) == pytest.approx(expected[0])
+    with pytest.raises(ValueError):
+        predictor.predict_features(features[:, :-1])
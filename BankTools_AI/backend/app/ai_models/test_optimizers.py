@@ -0,0 +1,91 @@
+"""
+Tests for the LogisticRegression optimizers
+"""
+
+import numpy as np
+import pytest
+
+from app.ai_models.shared.base_model import LogisticRegression
+
+
+def _separable_data(m=400, n=4, seed=0):
+    """Standardized features with labels from a known linear boundary"""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((m, n))
+    y = (X @ np.array([2.0, -1.5, 1.0, 0.5]) + 0.3 > 0).astype(np.float64)
+    return X, y
+
+
+def _accuracy(model, X, y):
+    return np.mean(model.predict(X) == y)
+
+
+@pytest.mark.parametrize('optimizer', LogisticRegression.OPTIMIZERS)
+def test_fit_learns_separable_data(optimizer):
+    X, y = _separable_data()
+    model = LogisticRegression(learning_rate=0.1, max_iterations=500, optimizer=optimizer, random_state=0)
+    model.fit(X, y)
+
+    assert _accuracy(model, X, y) > 0.95
+    assert model.n_iter_ > 0
+
+
+@pytest.mark.parametrize('optimizer', LogisticRegression.OPTIMIZERS)
+def test_fit_weighted_honors_the_optimizer(optimizer):
+    X, y = _separable_data()
+    weights = np.where(y == 1, 2.0, 1.0)
+    model = LogisticRegression(learning_rate=0.1, max_iterations=500, optimizer=optimizer, random_state=0)
+    model.fit_weighted(X, y, weights)
+
+    # Up-weighting one class shifts the boundary, so a little accuracy is lost
+    assert _accuracy(model, X, y) > 0.9
+    assert model.n_iter_ > 0
+
+
+def test_fit_weighted_optimizers_take_different_paths():
+    X, y = _separable_data()
+    models = {}
+    for optimizer in ('gd', 'momentum', 'adam'):
+        models[optimizer] = LogisticRegression(learning_rate=0.1, max_iterations=50, tolerance=0.0,
+                                               optimizer=optimizer, random_state=0)
+        models[optimizer].fit_weighted(X, y)
+
+    assert not np.allclose(models['gd'].weights, models['momentum'].weights)
+    assert not np.allclose(models['gd'].weights, models['adam'].weights)
+
+
+def test_minibatch_fit_learns_separable_data():
+    X, y = _separable_data()
+    model = LogisticRegression(learning_rate=0.1, max_iterations=50, batch_size=32, random_state=0)
+    model.fit(X, y)
+
+    assert _accuracy(model, X, y) > 0.95
+
+
+def test_fit_is_reproducible_with_random_state():
+    X, y = _separable_data()
+    first, second = (LogisticRegression(max_iterations=50, random_state=7) for _ in range(2))
+    first.fit(X, y)
+    second.fit(X, y)
+
+    np.testing.assert_array_equal(first.weights, second.weights)
+    assert first.bias == second.bias
+
+
+def test_log_cost_every_thins_the_cost_history():
+    X, y = _separable_data()
+    model = LogisticRegression(max_iterations=100, tolerance=0.0, log_cost_every=10, random_state=0)
+    model.fit(X, y)
+
+    assert len(model.cost_history) == 10
+
+
+def test_unknown_optimizer_is_rejected():
+    with pytest.raises(ValueError):
+        LogisticRegression(optimizer='rmsprop')
+
+
+def test_fit_weighted_rejects_minibatches():
+    X, y = _separable_data()
+    with pytest.raises(ValueError):
+        LogisticRegression(batch_size=32).fit_weighted(X, y)
@@ -0,0 +1,128 @@
+"""
+Tests for the prediction API endpoints
+"""
+
+import pytest
+
+from app import create_app, db
+from app.config import Config
+from app.models import User
+
+APPLICATION = {'amount': 150000, 'purpose': 'Home Purchase', 'income': 60000,
+               'employment_years': 5, 'credit_score': 720}
+CUSTOMER = {'CreditScore': 400, 'Geography': 'Germany', 'Gender': 'Female', 'Age': 45, 'Tenure': 1,
+            'Balance': 0, 'NumOfProducts': 1, 'HasCrCard': 0, 'IsActiveMember': 0, 'EstimatedSalary': 30000}
+
+
+class _TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = create_app(_TestingConfig)
+    # Sessions are injected directly, without a login request
+    app.login_manager.session_protection = None
+    with app.app_context():
+        db.create_all()
+        for role in ('banking_user', 'banking_employee'):
+            user = User(email=f'{role}@example.com', role=role)
+            user.set_password('password')
+            db.session.add(user)
+        db.session.commit()
+        user_ids = {user.role: user.id for user in User.query.all()}
+    app.user_ids = user_ids
+    yield app
+
+
+def _client(app, role):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(app.user_ids[role])
+        session['_fresh'] = True
+    return client
+
+
+@pytest.fixture
+def customer_client(app):
+    return _client(app, 'banking_user')
+
+
+@pytest.fixture
+def employee_client(app):
+    return _client(app, 'banking_employee')
+
+
+def test_predict_requires_login(app):
+    response = app.test_client().post('/api/predict-loan', json=APPLICATION)
+    assert response.status_code == 401
+
+
+def test_predict_loan(customer_client):
+    response = customer_client.post('/api/predict-loan', json=APPLICATION)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['success']
+    assert 0.0 <= body['prediction']['approval_probability'] <= 1.0
+    assert body['applicant_data'] == APPLICATION
+
+
+def test_predict_loan_missing_fields(customer_client):
+    response = customer_client.post('/api/predict-loan', json={'amount': 1})
+    assert response.status_code == 400
+    assert 'Missing required fields' in response.get_json()['error']
+
+
+def test_predict_loan_batch_matches_single_predictions(customer_client, employee_client):
+    single = customer_client.post('/api/predict-loan', json=APPLICATION).get_json()
+    response = employee_client.post('/api/predict-loan/batch',
+                                    json={'applications': [APPLICATION, APPLICATION]})
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['count'] == 2
+    for prediction in body['predictions']:
+        assert prediction['prediction'] == single['prediction']
+
+
+def test_predict_loan_batch_is_employee_only(customer_client):
+    response = customer_client.post('/api/predict-loan/batch', json={'applications': [APPLICATION]})
+    assert response.status_code == 403
+
+
+def test_predict_churn(employee_client):
+    response = employee_client.post('/api/predict-churn', json=CUSTOMER)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert 0.0 <= body['prediction']['churn_probability'] <= 1.0
+
+
+def test_predict_churn_is_employee_only(customer_client):
+    response = customer_client.post('/api/predict-churn', json=CUSTOMER)
+    assert response.status_code == 403
+
+
+def test_predict_churn_batch_reports_invalid_customers(employee_client):
+    single = employee_client.post('/api/predict-churn', json=CUSTOMER).get_json()
+    response = employee_client.post('/api/predict-churn/batch',
+                                    json={'customers': [CUSTOMER, {'CreditScore': 400}]})
+    predictions = response.get_json()['predictions']
+
+    assert response.status_code == 200
+    assert predictions[0]['success']
+    assert predictions[0]['prediction']['churn_probability'] == pytest.approx(
+        single['prediction']['churn_probability'])
+    assert not predictions[1]['success']
+    assert 'Missing required fields' in predictions[1]['error']
+
+
+def test_model_status(employee_client):
+    response = employee_client.get('/api/model-status')
+    models = response.get_json()['models']
+
+    assert response.status_code == 200
+    assert models['churn_model']['loaded']
+    assert models['loan_model']['loaded']
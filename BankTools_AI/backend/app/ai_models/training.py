@@ -0,0 +1,130 @@
+"""
+Background model retraining for the /train-models endpoint
+
+Training runs in a single spawned worker process, so a retrain never blocks
+a request thread or grows the web process. Each submitted job gets a task
+id whose state can be polled; a job that is still queued or running is
+reused instead of starting a second one.
+"""
+
+import os
+import threading
+import uuid
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from .paths import dataset_path, model_path
+
+# Datasets and model files each predictor is trained from and saved to
+CHURN_DATASET = 'Churn_Modelling.csv'
+LOAN_DATASET = 'Loan Approval Training Dataset.csv'
+
+# Finished jobs kept for status polling; the oldest are dropped first
+MAX_TRACKED_JOBS = 20
+
+_executor: Optional[ProcessPoolExecutor] = None
+_jobs: Dict[str, Future] = {}
+_active_task_id: Optional[str] = None
+_jobs_lock = threading.Lock()
+
+
+def _test_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """Scalar test-set metrics of a train() result"""
+    return {name: float(value) for name, value in results['test_metrics'].items()
+            if name != 'confusion_matrix'}
+
+
+def _save_atomically(predictor, filename: str) -> None:
+    """Write the model next to its final path, then swap it in, so readers never see a partial file"""
+    path = model_path(filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    predictor.save_model(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def train_all_models() -> Dict[str, Dict[str, float]]:
+    """
+    Retrain the churn and loan models from their datasets and save them
+    
+    Runs in the training worker process. The churn model is the
+    class-balanced one from retrain_improved_churn.py, same as the deployed
+    model file.
+    
+    Returns:
+        Test-set metrics of each model
+    """
+    from .retrain_improved_churn import ImprovedChurnPredictor
+    from .loan.loan_model_clean import LoanPredictor
+    
+    # Same seed as the training scripts, for reproducible splits
+    np.random.seed(42)
+    churn_predictor = ImprovedChurnPredictor()
+    churn_results = churn_predictor.train_with_class_balancing(dataset_path(CHURN_DATASET))
+    _save_atomically(churn_predictor, 'churn_model.joblib')
+    
+    np.random.seed(42)
+    loan_predictor = LoanPredictor()
+    loan_results = loan_predictor.train(dataset_path(LOAN_DATASET))
+    _save_atomically(loan_predictor, 'loan_model.joblib')
+    
+    return {'churn': _test_metrics(churn_results), 'loan': _test_metrics(loan_results)}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """The training worker pool, created on first use in this process"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def submit_training(on_done: Callable[[Future], None] = None) -> str:
+    """
+    Queue a retrain of every model, or join the one already queued or running
+    
+    Args:
+        on_done: Called with the finished future (from a worker thread)
+        
+    Returns:
+        Task id to poll with training_status()
+    """
+    global _active_task_id
+    with _jobs_lock:
+        active = _jobs.get(_active_task_id)
+        if active is not None and not active.done():
+            return _active_task_id
+        
+        task_id = uuid.uuid4().hex
+        future = _get_executor().submit(train_all_models)
+        if on_done is not None:
+            future.add_done_callback(on_done)
+        
+        _jobs[task_id] = future
+        _active_task_id = task_id
+        while len(_jobs) > MAX_TRACKED_JOBS:
+            del _jobs[next(iter(_jobs))]
+        return task_id
+
+
+def training_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """
+    State of a training job: PENDING, RUNNING, SUCCESS (with the metrics) or FAILURE (with the error)
+    
+    Returns None for an unknown task id.
+    """
+    future = _jobs.get(task_id)
+    if future is None:
+        return None
+    if not future.done():
+        return {'state': 'RUNNING' if future.running() else 'PENDING'}
+    if future.cancelled():
+        return {'state': 'FAILURE', 'error': 'Training was cancelled'}
+    
+    error = future.exception()
+    if error is not None:
+        return {'state': 'FAILURE', 'error': str(error)}
+    return {'state': 'SUCCESS', 'metrics': future.result()}
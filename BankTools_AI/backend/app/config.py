@@ -20,6 +20,9 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
     
+    # Window (ms) for micro-batching concurrent single predictions; 0 scores each request directly
+    MODEL_BATCH_WINDOW_MS = float(os.environ.get('MODEL_BATCH_WINDOW_MS') or 0)
+    
     # Google OAuth configuration
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
@@ -0,0 +1,61 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+
+from flask import current_app, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson instead of the stdlib json module
+    
+    Keeps the DefaultJSONProvider behaviour (sorted keys, indent in debug mode,
+    fallback serialization for dates, decimals and UUIDs). Dates are passed
+    through to that fallback, so they stay HTTP dates rather than orjson's
+    ISO 8601.
+    """
+    
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def init_json_provider(app) -> None:
+    """Switch the app to the orjson provider when orjson is installed"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+
+def json_response(payload, status: int = 200):
+    """
+    Build a JSON response from a payload, serialized straight to bytes by orjson
+    
+    Same output as jsonify (the app's sort_keys and default serialization
+    apply), without the bytes -> str -> bytes round trip; numpy scalars and
+    arrays are serialized natively. Falls back to jsonify without orjson.
+    """
+    if orjson is None:
+        return jsonify(payload), status
+    
+    provider = current_app.json
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+    if provider.sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return current_app.response_class(
+        orjson.dumps(payload, default=provider.default, option=option),
+        status=status,
+        mimetype=provider.mimetype
+    )
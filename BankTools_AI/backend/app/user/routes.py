@@ -3,12 +3,26 @@ from flask_login import login_required, current_user, logout_user
 from app import db
 from app.user import bp
 from app.models import LoanRequest, User, ChurnAnalysis
+from app.json_provider import json_response
 from app.ai_models.loan.loan_utils import (
     validate_frontend_loan_data, 
     predict_loan_approval,
     format_prediction_response
 )
 import traceback
+from types import MappingProxyType
+
+# Model inputs the simple loan form doesn't collect, shared read-only by every request
+_DEFAULT_MODEL_INPUT = MappingProxyType({
+    'Gender': 'Male',  # Default, could be enhanced to collect this
+    'Married': 'Yes',  # Default, could be enhanced to collect this
+    'Dependents': 0,   # Default, could be enhanced to collect this
+    'Education': 'Graduate',  # Default based on typical banking customers
+    'Self_Employed': 'No',    # Default; stable employment is assumed either way
+    'CoapplicantIncome': 0,   # Default, could be enhanced to collect this
+    'Loan_Amount_Term': 360,  # Default 30-year term
+    'Property_Area': 'Urban'  # Default, could be enhanced to collect this
+})
 
 def get_loan_predictor():
     """Get the loan predictor instance from the AI models module"""
@@ -23,26 +37,13 @@ def map_form_data_to_model_format(form_data):
     Map the simple loan request form data to the format expected by the AI model
     This function handles the conversion between the simplified form and the full model input
     """
-    # Default values for fields not in the simple form
-    model_data = {
-        'Gender': 'Male',  # Default, could be enhanced to collect this
-        'Married': 'Yes',  # Default, could be enhanced to collect this
-        'Dependents': 0,   # Default, could be enhanced to collect this
-        'Education': 'Graduate',  # Default based on typical banking customers
-        'Self_Employed': 'No',    # Default, could be enhanced to collect this
+    # Only the fields derived from the form are built per call
+    return {
+        **_DEFAULT_MODEL_INPUT,
         'ApplicantIncome': form_data.get('income', 0),
-        'CoapplicantIncome': 0,   # Default, could be enhanced to collect this
         'LoanAmount': form_data.get('amount', 0) / 1000,  # Convert to thousands
-        'Loan_Amount_Term': 360,  # Default 30-year term
-        'Credit_History': 1 if form_data.get('credit_score', 0) >= 650 else 0,
-        'Property_Area': 'Urban'  # Default, could be enhanced to collect this
+        'Credit_History': 1 if form_data.get('credit_score', 0) >= 650 else 0
     }
-    
-    # Enhance mapping based on available data
-    if form_data.get('employment_years', 0) >= 5:
-        model_data['Self_Employed'] = 'No'  # Stable employment
-    
-    return model_data
 
 @bp.route('/profile')
 @login_required
@@ -144,7 +145,7 @@ def update_password():
 def get_loan_requests():
     """Get user's loan request history"""
     if current_user.role != 'banking_user':
-        return jsonify({'error': 'Unauthorized access'}), 403
+        return json_response({'error': 'Unauthorized access'}, 403)
     
     try:
         loan_requests = LoanRequest.query.filter_by(user_id=current_user.id).order_by(LoanRequest.created_at.desc()).all()
@@ -175,11 +176,11 @@ def get_loan_requests():
                 'created_at': req.created_at.isoformat() if req.created_at else None
             })
         
-        return jsonify({'loan_requests': requests_data})
+        return json_response({'loan_requests': requests_data})
         
     except Exception as e:
         current_app.logger.error(f"Error fetching loan requests: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}, 500)
 
 @bp.route('/loan-request', methods=['POST'])
 @login_required
@@ -189,7 +190,7 @@ def submit_loan_request():
     This endpoint now uses the new model with SelectKBest feature selection
     """
     if current_user.role != 'banking_user':
-        return jsonify({'error': 'Unauthorized access'}), 403
+        return json_response({'error': 'Unauthorized access'}, 403)
     
     try:
         data = request.get_json()
@@ -198,7 +199,7 @@ def submit_loan_request():
         is_valid, error_message = validate_frontend_loan_data(data)
         
         if not is_valid:
-            return jsonify({'error': error_message}), 400
+            return json_response({'error': error_message}, 400)
         
         # Get AI prediction using system
         prediction_result = predict_loan_approval(data)
@@ -211,7 +212,7 @@ def submit_loan_request():
             income=data['income'],
             employment_years=data['employment_years'],
             credit_score=data['credit_score'],
-            prediction=prediction_result['approval_status'].lower()
+            prediction=prediction_result.approval_status.lower()
         )
         
         db.session.add(loan_request)
@@ -222,14 +223,14 @@ def submit_loan_request():
         response['message'] = 'Loan request processed successfully with AI model'
         
         current_app.logger.info(f"Loan request {loan_request.id} processed for user {current_user.id}: "
-                              f"{prediction_result['approval_status']} using {prediction_result['prediction_method']}")
+                              f"{prediction_result.approval_status} using {prediction_result.prediction_method}")
         
-        return jsonify(response)
+        return json_response(response)
         
     except Exception as e:
         current_app.logger.error(f"Error in loan request processing: {str(e)}")
         traceback.print_exc()
-        return jsonify({'error': 'Internal server error during loan request processing'}), 500
+        return json_response({'error': 'Internal server error during loan request processing'}, 500)
 
 @bp.route('/loan-request/<int:loan_id>', methods=['GET'])
 @login_required
@@ -239,14 +240,14 @@ def get_loan_request_details(loan_id):
     Only the owner can access their own loan request
     """
     if current_user.role != 'banking_user':
-        return jsonify({'error': 'Unauthorized access'}), 403
+        return json_response({'error': 'Unauthorized access'}, 403)
     
     try:
         # Ensure user can only access their own loan requests
         loan_request = LoanRequest.query.filter_by(id=loan_id, user_id=current_user.id).first()
         
         if not loan_request:
-            return jsonify({'error': 'Loan request not found or access denied'}), 404
+            return json_response({'error': 'Loan request not found or access denied'}, 404)
         
         # Convert prediction to proper status
         status = 'Pending'  # Default status
@@ -272,11 +273,11 @@ def get_loan_request_details(loan_id):
             'created_at': loan_request.created_at.isoformat()
         }
         
-        return jsonify({'loan_request': loan_data})
+        return json_response({'loan_request': loan_data})
         
     except Exception as e:
         current_app.logger.error(f"Error fetching loan request {loan_id} for user {current_user.id}: {str(e)}")
-        return jsonify({'error': 'Failed to fetch loan request details'}), 500
+        return json_response({'error': 'Failed to fetch loan request details'}, 500)
 
 @bp.route('/loan-request/<int:loan_id>', methods=['DELETE'])
 @login_required
@@ -286,14 +287,14 @@ def delete_loan_request(loan_id):
     Only the owner can delete their own loan request
     """
     if current_user.role != 'banking_user':
-        return jsonify({'error': 'Unauthorized access'}), 403
+        return json_response({'error': 'Unauthorized access'}, 403)
     
     try:
         # Ensure user can only delete their own loan requests
         loan_request = LoanRequest.query.filter_by(id=loan_id, user_id=current_user.id).first()
         
         if not loan_request:
-            return jsonify({'error': 'Loan request not found or access denied'}), 404
+            return json_response({'error': 'Loan request not found or access denied'}, 404)
         
         # Store loan details for response
         loan_purpose = loan_request.purpose
@@ -303,7 +304,7 @@ def delete_loan_request(loan_id):
         db.session.delete(loan_request)
         db.session.commit()
         
-        return jsonify({
+        return json_response({
             'success': True,
             'message': f'Loan request for {loan_purpose} (${loan_amount:,.2f}) has been successfully deleted'
         })
@@ -311,7 +312,7 @@ def delete_loan_request(loan_id):
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error deleting loan request {loan_id} for user {current_user.id}: {str(e)}")
-        return jsonify({'error': 'Failed to delete loan request'}), 500
+        return json_response({'error': 'Failed to delete loan request'}, 500)
 
 @bp.route('/delete-account', methods=['DELETE'])
 @login_required